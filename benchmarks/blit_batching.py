@@ -0,0 +1,35 @@
+import common
+import pygame
+
+
+def per_sprite(screen, sprites, offset):
+    for sprite in sprites:
+        screen.blit(sprite.image, sprite.rect.topleft - offset)
+
+
+def batched(screen, sprites, offset):
+    ox, oy = int(offset.x), int(offset.y)
+    screen.blits([(sprite.image, (sprite.rect.x - ox, sprite.rect.y - oy)) for sprite in sprites], doreturn=False)
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game, 'tavern')
+    scene.camera.update(0, scene.target)
+    scene.render_queue.refresh()
+
+    screen = game.screen
+    offset = scene.camera.offset
+    visible = scene.render_queue.in_order(scene.room.spatial_index.query_rect(scene.camera.visible_window))
+    every = scene.render_queue.sprites()
+
+    for label, sprites in (('visible', visible), ('whole scene', every)):
+        print(f'tavern, {label}: {len(sprites)} sprites')
+        common.report('per-sprite blit', common.timeit(lambda: per_sprite(screen, sprites, offset)))
+        common.report('Surface.blits', common.timeit(lambda: batched(screen, sprites, offset)))
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
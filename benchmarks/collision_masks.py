@@ -0,0 +1,29 @@
+import time
+import common
+import config
+
+# Compile every scene on each visit so the mask work is not hidden by the
+# on-disk scene cache.
+config.SCENE_CACHE_DIR = None
+
+SCENES = ['tavern', 'kitchen', 'toilet', 'room1']
+
+
+def main():
+    game = common.make_game()
+    from core.scene_cache import scene_cache
+    from utils.mask_cache import mask_cache
+
+    for visit in range(3):
+        start = time.perf_counter()
+        for scene_name in SCENES:
+            scene_cache.scenes.pop(scene_name, None)
+            common.load_scene(game, scene_name)
+        elapsed = time.perf_counter() - start
+        stats = mask_cache.stats()
+        print(f"visit {visit + 1}: {elapsed * 1e3:7.1f} ms for {len(SCENES)} scenes, "
+              f"masks built {stats['misses']}, reused {stats['hits']}, hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def make_game():
+    from game import Game
+    return Game()
+
+
+def load_scene(game, scene_name='tavern', entry_point='enter'):
+    from core.state import Scene
+    scene = Scene(game, scene_name, entry_point)
+    scene.enter_state()
+    return scene
+
+
+def timeit(func, repeat=5, number=200):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, seconds):
+    print(f'{name:<32} {seconds * 1e6:10.1f} us')
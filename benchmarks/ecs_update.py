@@ -0,0 +1,56 @@
+import random
+import common
+
+GUESTS = 500
+DT = 1 / 60
+
+
+def legacy_update(entity, dt):
+    # Entity.update as it was before behaviours were precomputed.
+    from core.entity_component_system import CharacterStateComponent
+    state_comp = entity.get_component(CharacterStateComponent)
+    for component in entity.components.values():
+        if component != state_comp and hasattr(component, 'update'):
+            component.update(dt)
+    if state_comp: state_comp.update(dt)
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    from core.entity_component_system import World
+
+    random.seed(1)
+    room = scene.room
+    guests = [scene.factory.create_guest(pos=random.choice(room.spawn_points)) for _ in range(GUESTS)]
+    objects = list(room.objects)
+    entities = objects + guests
+    world = World()
+    for entity in entities:
+        world.add(entity)
+
+    behaviours = sum(len(entity.behaviours) for entity in entities)
+    components = sum(len(entity.components) for entity in entities)
+    print(f'{len(objects)} objects + {GUESTS} guests, {components} components, {behaviours} with update')
+
+    def legacy():
+        for entity in entities:
+            if hasattr(entity, 'update'):
+                legacy_update(entity, DT)
+
+    def per_entity():
+        for entity in entities:
+            entity.update(DT)
+
+    def systems():
+        world.update(DT)
+
+    for _ in range(30):
+        systems()
+    common.report('legacy hasattr loop', common.timeit(legacy, number=20))
+    common.report('Entity.update behaviours', common.timeit(per_entity, number=20))
+    common.report('World.update systems', common.timeit(systems, number=20))
+
+
+if __name__ == '__main__':
+    main()
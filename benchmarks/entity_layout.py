@@ -0,0 +1,55 @@
+import random
+import tracemalloc
+import common
+
+GUESTS = 500
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    from core.entity_component_system import CharacterMovementComponent
+    from items.slot import InventorySlot
+
+    random.seed(1)
+    spawn_points = scene.room.spawn_points
+    scene.factory.create_guest(pos=spawn_points[0])
+
+    # Animation frames are shared through the asset cache, so this measures
+    # the entity and component objects themselves.
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    guests = [scene.factory.create_guest(pos=random.choice(spawn_points)) for _ in range(GUESTS)]
+    per_guest = (tracemalloc.get_traced_memory()[0] - before) / GUESTS
+    slots = [InventorySlot('egg', 1) for _ in range(1000)]
+    per_slot = (tracemalloc.get_traced_memory()[0] - before - per_guest * GUESTS) / len(slots)
+    tracemalloc.stop()
+    print(f'guest entity  {per_guest:8.0f} bytes')
+    print(f'InventorySlot {per_slot:8.0f} bytes')
+
+    guest = guests[0]
+    movement = guest.get_component(CharacterMovementComponent)
+    slot = slots[0]
+
+    def hitbox():
+        for _ in range(100): guest.hitbox
+
+    def rect():
+        for _ in range(100): guest.rect
+
+    def sprite():
+        for _ in range(100): guest.sprite
+
+    def velocity():
+        for _ in range(100): movement.vel
+
+    def slot_amount():
+        for _ in range(100): slot.amount
+
+    for name, func in (('entity.hitbox', hitbox), ('entity.rect', rect), ('entity.sprite', sprite),
+                       ('movement.vel', velocity), ('slot.amount', slot_amount)):
+        common.report(f'{name} x100', common.timeit(func, number=2000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import time
+import pygame
+import common
+
+FRAMES = 300
+DT = 1 / 60
+
+
+def realtime(game, frames):
+    # The regular loop body without the clock cap: simulate and draw.
+    from core.game_time import game_time
+    from entities.room import room_manager
+    from ui.ui_manager import ui_manager
+    start = time.perf_counter()
+    for _ in range(frames):
+        game_time.update(DT)
+        room_manager.update_all_rooms(DT)
+        state = game.get_current_state()
+        state.update(DT)
+        ui_manager.set_context(game.screen, state)
+        state.draw(game.screen)
+        ui_manager.draw()
+        pygame.display.flip()
+    elapsed = time.perf_counter() - start
+    return frames * DT / elapsed
+
+
+def seat_guest(room):
+    from core.entity_component_system import CharacterStateComponent, ChairComponent, Sitting
+    chair = room.get_free_chair()
+    room.spawn_npc()
+    guest = room.npcs[-1]
+    chair.get_component(ChairComponent).occupy(guest)
+    state_comp = guest.get_component(CharacterStateComponent)
+    state_comp.chair = chair
+    state_comp.set_state(Sitting(guest))
+    return guest
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    from core.fast_forward import FastForward
+    from core.game_time import game_time
+
+    print(f'{"drawn at 60 fps":<28} {realtime(game, FRAMES):8.1f} sim min/s (uncapped)')
+
+    for minutes in (60, 600):
+        result = FastForward(game, minutes, stop_on_order=False).run()
+        print(f'{f"fast-forward {minutes} min":<28} {result["rate"]:8.1f} sim min/s '
+              f'({result["seconds"]:.2f} s wall, now {game_time.get_time_string()[0]})')
+
+    # Guests walking in from the door rarely reach a chair within a run, so
+    # seat one directly; it orders once its sitting and deciding timers end.
+    seated = seat_guest(scene.room)
+    result = FastForward(game, 24 * 60).run()
+    print(f'{"until next order":<28} {result["rate"]:8.1f} sim min/s, stopped by {result["reason"]} '
+          f'after {result["minutes"]:.1f} min ({seated.id} seated)')
+
+
+if __name__ == '__main__':
+    main()
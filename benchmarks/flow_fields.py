@@ -0,0 +1,56 @@
+import random
+import time
+import common
+
+CROWD = 100
+
+
+def path_cost(path):
+    return sum(1.414 if ax != bx and ay != by else 1 for (ax, ay), (bx, by) in zip(path, path[1:]))
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    room = scene.room
+    from utils.pathfinding import astar
+    from utils.flow_field import FlowField
+
+    start = time.perf_counter()
+    room._initialize()
+    print(f'grid and {len(room.flow_fields)} fields built in {(time.perf_counter() - start) * 1e3:.1f} ms')
+
+    # A rush: every guest walks in from the entrance (or a random free cell)
+    # to one of the chairs.
+    rng = random.Random(1)
+    size = room.sub_tile_size
+    entrances = [(int(x // size), int(y // size)) for x, y in room.spawn_points]
+    cells = [(x, y) for y, row in enumerate(room.grid) for x, cell in enumerate(row) if cell == 0]
+    chairs = [goal for chair in room.chairs if (goal := room.find_target(chair))]
+    rushes = (('from the entrance', [(rng.choice(entrances), rng.choice(chairs)) for _ in range(CROWD)]),
+              ('from anywhere', [(rng.choice(cells), rng.choice(chairs)) for _ in range(CROWD)]))
+
+    for name, queries in rushes:
+        start = time.perf_counter()
+        searched = [astar(room.grid, a, b) for a, b in queries]
+        searching = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fields = {goal: FlowField(*room.nav_cells, goal) for goal in {b for _, b in queries}}
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        walked = [fields[b].path(a) for a, b in queries]
+        follow = time.perf_counter() - start
+
+        reachable = [(a, b) for a, b in zip(searched, walked) if a or b]
+        same = sum(bool(a and b) and abs(path_cost(a) - path_cost(b)) < 1e-9 for a, b in reachable)
+        print(f'{CROWD} guests {name}, {len(fields)} goals')
+        common.report('  astar per guest, total', searching)
+        common.report('  fields built, total', build)
+        common.report('  following fields, total', follow)
+        common.report('  following fields, per guest', follow / CROWD)
+        print(f'  {same}/{len(reachable)} reachable paths with the same cost as astar')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import random
+import time
+import common
+from pathfinding import synthetic_grid, path_cost
+
+QUERIES = 100
+SIZE = 500
+DENSITY = 0.25
+
+
+def compare(name, grid, queries):
+    from utils.pathfinding import astar
+    from config import HPA_CLUSTER_SIZE
+    from utils.hpa import ClusterGraph
+
+    start = time.perf_counter()
+    graph = ClusterGraph(grid, HPA_CLUSTER_SIZE)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flat = [astar(grid, a, b) for a, b in queries]
+    searching = (time.perf_counter() - start) / len(queries)
+    start = time.perf_counter()
+    hierarchical = [graph.find_path(a, b) for a, b in queries]
+    abstract = (time.perf_counter() - start) / len(queries)
+
+    ratios = [path_cost(b) / path_cost(a) for a, b in zip(flat, hierarchical) if a and b and len(a) > 1]
+    missed = sum((a is None) != (b is None) for a, b in zip(flat, hierarchical))
+    ratios.sort()
+    print(f'{name}: {graph.columns}x{graph.rows} clusters of {HPA_CLUSTER_SIZE}, '
+          f'{sum(len(cells) for cells in graph.entrances.values())} transitions')
+    common.report('  build', build)
+    common.report('  astar per query', searching)
+    common.report('  hpa per query', abstract)
+    print(f'  path cost vs astar: mean {sum(ratios) / len(ratios):.3f}, '
+          f'median {ratios[len(ratios) // 2]:.3f}, worst {ratios[-1]:.3f}, {missed} reachability mismatches')
+    return graph
+
+
+def rebuild(graph, grid, x, y, size):
+    # An object the size of a table placed and then taken away again.
+    from utils.hpa import ClusterGraph
+    from config import HPA_CLUSTER_SIZE
+    saved = [row[x:x + size] for row in grid[y:y + size]]
+    for row in grid[y:y + size]:
+        row[x:x + size] = [1] * size
+    start = time.perf_counter()
+    placed = graph.updated(grid)
+    local = time.perf_counter() - start
+    start = time.perf_counter()
+    ClusterGraph(grid, HPA_CLUSTER_SIZE)
+    full = time.perf_counter() - start
+    for row, cells in zip(grid[y:y + size], saved):
+        row[x:x + size] = cells
+    common.report(f'  place {size}x{size} object, local', local)
+    common.report(f'  place {size}x{size} object, full', full)
+    print(f'  {placed.rebuilt} of {graph.columns * graph.rows} clusters rebuilt')
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    room = scene.room
+    room._initialize()
+
+    rng = random.Random(1)
+    cells = [(x, y) for y, row in enumerate(room.grid) for x, cell in enumerate(row) if cell == 0]
+    grid = [list(row) for row in room.grid]
+    graph = compare(f'tavern {len(grid[0])}x{len(grid)}', grid,
+                    [(rng.choice(cells), rng.choice(cells)) for _ in range(QUERIES)])
+    rebuild(graph, grid, 40, 40, 10)
+
+    grid = synthetic_grid(SIZE, DENSITY, rng)
+    cells = [(x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 0]
+    graph = compare(f'synthetic {SIZE}x{SIZE}', grid, [(rng.choice(cells), rng.choice(cells)) for _ in range(QUERIES)])
+    rebuild(graph, grid, 250, 250, 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import random
+import time
+import common
+
+QUERIES = 500
+REPLANS = 0.4
+
+
+def workload(room, rng):
+    # Guests arriving at the entrance and heading for a chair, and guests
+    # replanning from somewhere along a route they were already given.
+    from utils.pathfinding import astar
+    size = room.sub_tile_size
+    entrances = [(int(x // size), int(y // size)) for x, y in room.spawn_points]
+    chairs = [goal for chair in room.chairs if (goal := room.find_target(chair))]
+    routes = {}
+    queries = []
+    for _ in range(QUERIES):
+        if routes and rng.random() < REPLANS:
+            path = routes[rng.choice(list(routes))]
+            queries.append((rng.choice(path), path[-1]))
+        else:
+            query = (rng.choice(entrances), rng.choice(chairs))
+            queries.append(query)
+            if query not in routes and (path := astar(room.grid, *query)):
+                routes[query] = path
+    return queries
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    room = scene.room
+    room._initialize()
+    from utils.pathfinding import astar
+    from utils.path_cache import PathCache
+
+    queries = workload(room, random.Random(1))
+
+    class Counter:
+        expanded = 0
+
+    counter = Counter()
+    start = time.perf_counter()
+    uncached = [astar(room.grid, a, b, counter) for a, b in queries]
+    searching = time.perf_counter() - start
+
+    cache = PathCache(256)
+    start = time.perf_counter()
+    cached = [cache.find(a, b, room.grid_version, lambda a, b: astar(room.grid, a, b, cache)) for a, b in queries]
+    caching = time.perf_counter() - start
+
+    def cost(path):
+        return sum(1.414 if ax != bx and ay != by else 1 for (ax, ay), (bx, by) in zip(path, path[1:]))
+
+    same = sum(abs(cost(a) - cost(b)) < 1e-9 and a[0] == b[0] and a[-1] == b[-1]
+               for a, b in zip(uncached, cached) if a and b)
+    print(f'{QUERIES} queries, {REPLANS:.0%} replans from along an earlier route')
+    common.report('astar every query, total', searching)
+    common.report('through PathCache, total', caching)
+    print(f'astar alone: {counter.expanded} cells expanded')
+    print(f'PathCache:   {cache.hits} hits ({cache.sliced} sliced), {cache.misses} misses, '
+          f'{cache.expanded} cells expanded, {len(cache)} paths kept')
+    print(f'{same}/{sum(1 for path in uncached if path)} paths with the same ends and cost')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import random
+import time
+import common
+
+RUSH = 20
+FRAME = 1 / 60
+
+
+def rush(room, rng):
+    cells = [(x, y) for y, row in enumerate(room.grid) for x, cell in enumerate(row) if cell == 0]
+    chairs = [goal for chair in room.chairs if (goal := room.find_target(chair))]
+    return [(rng.choice(cells), rng.choice(chairs)) for _ in range(RUSH)]
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    room = scene.room
+    room._initialize()
+    import entities.room
+    from core.path_service import PathService
+    from utils.path_cache import PathCache
+
+    # The spike comes from cold searches, so astar and an empty cache.
+    entities.room.NAVIGATION_MODE = 'astar'
+    queries = rush(room, random.Random(1))
+
+    room.path_cache = PathCache(256)
+    start = time.perf_counter()
+    for a, b in queries:
+        room.find_path(a, b)
+    inline = time.perf_counter() - start
+    print(f'{RUSH} guests deciding on one frame, cold cache')
+    common.report('inline: deciding frame', inline)
+
+    for workers in (1, 2, 4):
+        room.path_cache = PathCache(256)
+        service = PathService(workers=workers)
+        start = time.perf_counter()
+        requests = [service.request(room, a, b) for a, b in queries]
+        submitting = time.perf_counter() - start
+
+        # Frames at 60 fps: the main thread applies results, then waits for
+        # vsync, which is when the workers get the interpreter to themselves.
+        frames, worst, began = 0, 0, time.perf_counter()
+        while not all(request.done for request in requests):
+            frame_start = time.perf_counter()
+            service.update()
+            worst = max(worst, time.perf_counter() - frame_start)
+            frames += 1
+            time.sleep(max(0.0, FRAME - (time.perf_counter() - frame_start)))
+        service.executor.shutdown()
+        print(f'service, {workers} worker(s)')
+        common.report('  deciding frame', submitting)
+        common.report('  worst update()', worst)
+        print(f'  all {RUSH} paths applied after {frames} frames ({(time.perf_counter() - began) * 1e3:.0f} ms), '
+              f'{room.path_cache.expanded} cells expanded')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import heapq
+import random
+import time
+import common
+
+TAVERN_QUERIES = 200
+SYNTHETIC_SIZE = 500
+SYNTHETIC_QUERIES = 20
+SYNTHETIC_DENSITY = 0.25
+# The old search scans its open list on every expansion, so on large grids
+# it only gets short queries within a bounded number of seconds.
+LEGACY_BUDGET = 20.0
+
+
+class LegacyNode:
+    # The search utils/pathfinding.astar used before the flat arrays.
+    def __init__(self, position, parent=None):
+        self.position = position
+        self.parent = parent
+        self.g = 0
+        self.h = 0
+        self.f = 0
+
+    def __eq__(self, other):
+        return self.position == other.position
+
+    def __lt__(self, other):
+        return self.f < other.f
+
+
+def legacy_astar(grid, start, end):
+    start_node = LegacyNode(start)
+    end_node = LegacyNode(end)
+    open_list = []
+    closed_list = set()
+    heapq.heappush(open_list, start_node)
+    while open_list:
+        current_node = heapq.heappop(open_list)
+        closed_list.add(current_node.position)
+        if current_node == end_node:
+            path = []
+            current = current_node
+            while current is not None:
+                path.append(current.position)
+                current = current.parent
+            return path[::-1]
+        (x, y) = current_node.position
+        moves = [(0, -1, 1), (0, 1, 1), (-1, 0, 1), (1, 0, 1),
+                 (-1, -1, 1.414), (1, -1, 1.414), (-1, 1, 1.414), (1, 1, 1.414)]
+        for move_x, move_y, move_cost in moves:
+            new_position = (x + move_x, y + move_y)
+            (node_x, node_y) = new_position
+            if not (0 <= node_y < len(grid) and 0 <= node_x < len(grid[0])):
+                continue
+            if grid[node_y][node_x] != 0:
+                continue
+            if move_x != 0 and move_y != 0:
+                if grid[y][x + move_x] != 0 or grid[y + move_y][x] != 0:
+                    continue
+            if new_position in closed_list:
+                continue
+            new_node = LegacyNode(new_position, current_node)
+            if new_node in open_list:
+                continue
+            new_node.g = current_node.g + move_cost
+            new_node.h = abs(new_node.position[0] - end_node.position[0]) + \
+                         abs(new_node.position[1] - end_node.position[1])
+            new_node.f = new_node.g + new_node.h
+            heapq.heappush(open_list, new_node)
+    return None
+
+
+def path_cost(path):
+    if not path:
+        return None
+    return sum(1.414 if ax != bx and ay != by else 1 for (ax, ay), (bx, by) in zip(path, path[1:]))
+
+
+def free_cells(grid):
+    return [(x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 0]
+
+
+def compare(name, grid, queries, budget=None):
+    from utils.pathfinding import astar
+
+    start = time.perf_counter()
+    new_paths = [astar(grid, a, b) for a, b in queries]
+    new_time = (time.perf_counter() - start) / len(queries)
+
+    old_paths = []
+    start = time.perf_counter()
+    for a, b in queries:
+        old_paths.append(legacy_astar(grid, a, b))
+        if budget is not None and time.perf_counter() - start > budget:
+            break
+    old_time = (time.perf_counter() - start) / len(old_paths)
+
+    shorter = same = longer = mismatched = 0
+    for old, new in zip(old_paths, new_paths):
+        old_cost, new_cost = path_cost(old), path_cost(new)
+        if (old_cost is None) != (new_cost is None):
+            mismatched += 1
+        elif old_cost is None or abs(old_cost - new_cost) < 1e-9:
+            same += 1
+        elif new_cost < old_cost:
+            shorter += 1
+        else:
+            longer += 1
+
+    print(f'{name}: {len(queries)} queries, old search ran {len(old_paths)}')
+    common.report('  old astar per query', old_time)
+    common.report('  new astar per query', new_time)
+    print(f'  paths: {same} same cost, {shorter} shorter, {longer} longer, {mismatched} found by only one')
+
+
+def synthetic_grid(size, density, rng):
+    grid = [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    # A few long walls with gaps so paths have to detour.
+    for x in range(size // 5, size, size // 5):
+        gap = rng.randrange(size)
+        for y in range(size):
+            if abs(y - gap) > 2:
+                grid[y][x] = 1
+    return grid
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game)
+    room = scene.room
+    room._initialize()
+
+    rng = random.Random(1)
+    cells = free_cells(room.grid)
+    queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(TAVERN_QUERIES)]
+    print(f'tavern grid {len(room.grid[0])}x{len(room.grid)}')
+    compare('tavern, random free cells', room.grid, queries)
+
+    grid = synthetic_grid(SYNTHETIC_SIZE, SYNTHETIC_DENSITY, rng)
+    cells = free_cells(grid)
+    queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(SYNTHETIC_QUERIES)]
+    compare(f'synthetic {SYNTHETIC_SIZE}x{SYNTHETIC_SIZE}, random free cells', grid, queries, LEGACY_BUDGET)
+
+    local = []
+    while len(local) < SYNTHETIC_QUERIES:
+        a = rng.choice(cells)
+        b = (a[0] + rng.randint(-30, 30), a[1] + rng.randint(-30, 30))
+        if 0 <= b[0] < SYNTHETIC_SIZE and 0 <= b[1] < SYNTHETIC_SIZE and grid[b[1]][b[0]] == 0:
+            local.append((a, b))
+    compare(f'synthetic {SYNTHETIC_SIZE}x{SYNTHETIC_SIZE}, within 30 cells', grid, local, LEGACY_BUDGET)
+
+
+if __name__ == '__main__':
+    main()
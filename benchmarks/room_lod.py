@@ -0,0 +1,61 @@
+import time
+import common
+
+FRAMES = 1200
+DT = 1 / 60
+
+
+def light_stoves(room):
+    from core.entity_component_system import StoveComponent
+    stoves = []
+    for entity in room.objects:
+        if stove := entity.get_component(StoveComponent):
+            stove.load_state({'is_cooking': True, 'fluid_amount': 40, 'cooking_timer': 7.5,
+                              'current_recipe': {'id': 'soup_1', 'result': 'soup_1'}})
+            stoves.append(stove)
+    return stoves
+
+
+def stove_state(stove):
+    return stove.fluid_amount, stove.is_cooking, round(stove.cooking_timer, 6), stove.result_slot.item_id
+
+
+def main():
+    game = common.make_game()
+    from entities.room import room_manager
+    from core.timers import timers
+
+    for scene_name in ('kitchen', 'toilet', 'room1', 'tavern'):
+        common.load_scene(game, scene_name)
+    kitchen = next(room for room in room_manager.rooms.values() if 'kitchen' in room.json_path)
+    tavern = room_manager.active_room
+
+    def every_room():
+        # Old loop: all rooms at full rate, the current one ticked twice.
+        for room in room_manager.rooms.values():
+            room.update(DT)
+        tavern.update(DT)
+
+    for name, tick in (('full rate, current twice', every_room),
+                       ('scheduled', lambda: room_manager.update_all_rooms(DT))):
+        stoves = light_stoves(kitchen)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            timers.advance(DT)
+            tick()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<26} {elapsed / FRAMES * 1e6:8.1f} us/frame  kitchen stove {stove_state(stoves[0])}')
+
+    # The same 390 seconds of cooking, drained per frame and in one call.
+    stoves = light_stoves(kitchen)
+    for _ in range(390 * 60):
+        timers.advance(DT)
+    stepped = stove_state(stoves[0])
+    stoves = light_stoves(kitchen)
+    timers.advance(390)
+    print(f'390 s per frame {stepped}')
+    print(f'390 s one call {stove_state(stoves[0])}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+import time
+
+START = time.perf_counter()
+
+import common
+
+
+def child(use_bundle, use_scene_cache):
+    import config
+    if not use_bundle:
+        config.ASSET_BUNDLE = None
+    if not use_scene_cache:
+        config.SCENE_CACHE_DIR = None
+
+    import pygame
+    game = common.make_game()
+    game.get_current_state().draw(game.screen)
+    pygame.display.flip()
+    menu = time.perf_counter() - START
+
+    scene = common.load_scene(game)
+    scene.update(0)
+    scene.draw(game.screen)
+    pygame.display.flip()
+    tavern = time.perf_counter() - START
+    print(menu, tavern)
+
+
+def run(use_bundle, use_scene_cache, repeat):
+    results = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, __file__, 'child', str(int(use_bundle)), str(int(use_scene_cache))],
+                             capture_output=True, text=True, check=True).stdout
+        results.append(tuple(map(float, out.split()[-2:])))
+    return min(results)
+
+
+def main():
+    from utils.asset_bundle import ASSET_BUNDLE, open_bundle, build
+    if open_bundle() is None:
+        import pygame
+        pygame.display.set_mode((1, 1))
+        build()
+        print(f'Built {ASSET_BUNDLE}')
+
+    # Warm the compiled scene cache so the cached runs never compile.
+    run(True, True, repeat=1)
+    variants = (('loose files', False, False), ('asset bundle', True, False), ('bundle + scenes', True, True))
+    for name, use_bundle, use_scene_cache in variants:
+        menu, tavern = run(use_bundle, use_scene_cache, repeat=5)
+        print(f'{name:<16} menu {menu * 1e3:8.1f} ms   first tavern frame {tavern * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['child']:
+        child(sys.argv[2] == '1', sys.argv[3] == '1')
+    else:
+        main()
@@ -0,0 +1,81 @@
+import time
+import common
+
+FRAMES = 600
+DT = 1 / 60
+
+created = 0
+
+
+def count_dicts(value):
+    if isinstance(value, dict):
+        return 1 + sum(count_dicts(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(count_dicts(v) for v in value)
+    return 0
+
+
+def counted(func):
+    def wrapper(*args, **kwargs):
+        global created
+        result = func(*args, **kwargs)
+        created += count_dicts(result)
+        return result
+    return wrapper
+
+
+def legacy_snapshot(entities):
+    # What StateComponent.update and the tail of StoveComponent.update did
+    # every frame before snapshots became lazy.
+    from core.entity_component_system import StateComponent, StoveComponent
+    for entity in entities:
+        if stove := entity.get_component(StoveComponent):
+            stove.save_state()
+        if state_comp := entity.get_component(StateComponent):
+            for component in entity.components.values():
+                if hasattr(component, 'save_state'):
+                    state_comp.state.update(component.save_state())
+
+
+def run(room, legacy):
+    global created
+    created = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        room.world.update(DT)
+        if legacy:
+            legacy_snapshot(room.objects)
+    elapsed = time.perf_counter() - start
+    return created / FRAMES, elapsed / FRAMES
+
+
+def main():
+    game = common.make_game()
+    scene = common.load_scene(game, 'kitchen')
+    from core import entity_component_system as ecs
+    from items.slot import InventorySlot
+
+    for cls in (ecs.StoveComponent, ecs.StorageComponent, ecs.ToiletComponent, ecs.BedComponent,
+                ecs.TableComponent, ecs.ChairComponent, ecs.WoodComponent):
+        cls.save_state = counted(cls.save_state)
+    InventorySlot.to_dict = counted(InventorySlot.to_dict)
+
+    room = scene.room
+    for entity in room.objects:
+        if stove := entity.get_component(ecs.StoveComponent):
+            stove.fluid_amount = stove.fluid_max_amount
+
+    for name, legacy in (('per-frame snapshots', True), ('dirty-tracked', False)):
+        per_frame, seconds = run(room, legacy)
+        print(f'{name:<20} {per_frame:6.1f} dicts/frame {seconds * 1e6:8.1f} us/frame')
+
+    global created
+    created = 0
+    for entity in room.objects:
+        if state_comp := entity.get_component(ecs.StateComponent):
+            state_comp.get_state()
+    print(f'{"save pull":<20} {created:6d} dicts')
+
+
+if __name__ == '__main__':
+    main()
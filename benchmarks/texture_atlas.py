@@ -0,0 +1,63 @@
+import os
+import random
+import common
+import pygame
+from pytmx.util_pygame import load_pygame
+from config import CHARACTER_SPRITE_SIZE
+from utils.asset_loader import AssetLoader
+
+
+def load_everything(loader):
+    images = []
+    for filename in sorted(os.listdir('assets/items')):
+        if filename.endswith('.png'):
+            images.append(loader.get_item_image(filename, (32, 32)))
+
+    for name in sorted(os.listdir('assets/characters')):
+        path = os.path.join('assets/characters', name)
+        if os.path.isdir(path):
+            for frames in loader.get_animations(path, size=CHARACTER_SPRITE_SIZE).values():
+                images.extend(frames)
+
+    for filename in sorted(os.listdir('scenes/maps')):
+        if filename.endswith('.tmx'):
+            tmx_data = loader.pack_tmx(load_pygame(os.path.join('scenes/maps', filename)))
+            images.extend(image for image in tmx_data.images if image)
+    return images
+
+
+def pixel_bytes(images):
+    return sum(image.get_pitch() * image.get_height() for image in images)
+
+
+def blit_all(screen, images, positions):
+    screen.blits(list(zip(images, positions)), doreturn=False)
+
+
+def main():
+    game = common.make_game()
+    screen = game.screen
+
+    loose = load_everything(AssetLoader(pack=False))
+    packed_loader = AssetLoader(pack=True)
+    packed = load_everything(packed_loader)
+    report = packed_loader.atlas.report()
+
+    print(f'images loaded                {len(loose):8d}')
+    print(f'separate surfaces, before    {len(loose):8d}')
+    print(f'separate surfaces, after     {report["pages"]:8d} pages')
+    print(f'pixel bytes, before          {pixel_bytes(loose) / 1024:8.1f} KiB')
+    print(f'pixel bytes, after           {report["bytes"] / 1024:8.1f} KiB')
+    print(f'page utilisation             {report["utilisation"] * 100:8.1f} %')
+
+    random.seed(1)
+    width, height = screen.get_size()
+    positions = [(random.randrange(width), random.randrange(height)) for _ in loose]
+    common.report('blit loose surfaces', common.timeit(lambda: blit_all(screen, loose, positions), number=50))
+    common.report('blit atlas subsurfaces', common.timeit(lambda: blit_all(screen, packed, positions), number=50))
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import random
+import time
+import common
+
+COUNT = 2000
+FRAMES = 600
+DT = 1 / 60
+
+
+class PolledCooldown:
+    # How the countdown components ticked before the scheduler.
+    def __init__(self, cooldown):
+        self.is_used = True
+        self.cooldown_timer = cooldown
+
+    def update(self, dt):
+        if self.is_used:
+            self.cooldown_timer -= dt
+            if self.cooldown_timer <= 0: self.is_used = False
+
+
+def main():
+    common.make_game()
+    from core.entity_component_system import WoodComponent
+    from core.timers import timers
+
+    random.seed(1)
+    cooldowns = [random.uniform(1, 9) for _ in range(COUNT)]
+
+    polled = [PolledCooldown(cooldown) for cooldown in cooldowns]
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for component in polled:
+            component.update(DT)
+    polling = (time.perf_counter() - start) / FRAMES
+
+    woods = []
+    for cooldown in cooldowns:
+        wood = WoodComponent()
+        wood.is_used = True
+        wood.start_timer('cooldown', cooldown, wood._ready)
+        woods.append(wood)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        timers.advance(DT)
+    scheduled = (time.perf_counter() - start) / FRAMES
+
+    for wood, cooldown in zip(woods, cooldowns):
+        wood.is_used = True
+        wood.start_timer('cooldown', cooldown * 10, wood._ready)
+    start = time.perf_counter()
+    timers.advance(120)
+    drained = time.perf_counter() - start
+
+    print(f'{COUNT} cooldowns of 1-9 s, {FRAMES} frames')
+    common.report('polled per frame', polling)
+    common.report('scheduler per frame', scheduled)
+    common.report('drain 120 s in one call', drained)
+    print('all ready:', not any(wood.is_used for wood in woods))
+
+
+if __name__ == '__main__':
+    main()
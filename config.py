@@ -8,13 +8,54 @@ CHARACTER_SPRITE_SIZE = (64, 64)
 FONT = 'assets/homespun.ttf'
 
 INPUTS = {'escape': False,'space': False,'up': False,'down': False,'left': False,'right': False,
-          'left_click': False,'right_click': False,'scroll_up': False,'scroll_down': False,'tab':False,'interact':False,
+          'left_click': False,'right_click': False,'scroll_up': False,'scroll_down': False,'tab':False,'interact':False,'wait':False,
           "1":False,"2": False, "3": False, "4": False, "5": False,
           'mouse_pos': (0, 0)}
 
 COLOURS = {'red':(255,100,100) ,'blue':(100,100,255),'black':(0,0,0),'white':(255,255,255),'green':(100,255,100),'gray':(50,50,50),'dark_gray':(30,30,30),'dark_purple': (48, 25, 52),'light_gray':(100,100,100)}
 
 LAYERS = ['background','objects','windows','decorations','cosmetics','lighting','characters','interactive']
+DYNAMIC_LAYERS = ['objects', 'characters', 'interactive', 'decorations','windows']
+STATIC_CHUNK_SIZE = 256
+SPATIAL_CELL_SIZE = 96
+COLLISION_CELL_SIZE = 96
+DIRTY_RECTS = False
+TEXT_CACHE_SIZE = 512
+PACK_TEXTURES = False
+ATLAS_PAGE_SIZE = 1024
+ASSET_BUNDLE = 'assets/bundle.bin'
+SCENE_CACHE_DIR = 'scenes/cache'
+NAV_GRID_SCALE = 5
+# 'flow_field' walks guests down per-goal distance fields built with the
+# tavern grid; 'astar' searches every path on request. Both give shortest
+# paths. 'hpa' searches a graph of grid clusters and is opt-in, for layouts
+# too large for the other two: its paths are near-optimal, not shortest (up
+# to 1.25x the cost on the 500x500 benchmark), and the graph costs a
+# one-time build (1.7 s there) before the first query.
+NAVIGATION_MODE = 'flow_field'
+# Paths remembered per tavern, keyed by start, goal and grid version.
+PATH_CACHE_SIZE = 256
+# Worker threads searching guest paths (0 searches inline on request) and
+# how many finished searches are handed to guests per frame.
+PATH_WORKERS = 1
+PATH_RESULTS_PER_FRAME = 4
+# 'hpa' navigation clusters the grid into squares of this many cells.
+HPA_CLUSTER_SIZE = 10
+# Rooms the player is not in are caught up in batches of this many seconds,
+# with characters stepped no coarser than HIDDEN_ROOM_MAX_STEP.
+HIDDEN_ROOM_INTERVAL = 0.25
+HIDDEN_ROOM_MAX_STEP = 1 / 25
+# Fast-forward ("wait") steps in game-time seconds and redraws a progress
+# frame at most this often in wall-clock seconds.
+FAST_FORWARD_STEP = 1 / 25
+FAST_FORWARD_PROGRESS_INTERVAL = 0.25
+FAST_FORWARD_UNTIL_HOUR = 18
+# Shown for this many wall-clock seconds when a wait stops before its hour.
+FAST_FORWARD_NOTICE_TIME = 3
+FAST_FORWARD_NOTICES = {
+    'order': 'Wait stopped: a guest has ordered',
+    'interrupted': 'Wait interrupted',
+}
 
 SCENE_DATA = {
     'tavern':{'kitchen':'kitchen','toilet':'toilet','room1':'room1','room2':'room2','room3':'room3'},
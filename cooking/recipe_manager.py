@@ -1,4 +1,5 @@
 import json
+from utils.asset_bundle import asset_bundle
 
 class RecipeManager:
     def __init__(self):
@@ -6,6 +7,9 @@ class RecipeManager:
         self._load_recipes()
 
     def _load_recipes(self):
+        if asset_bundle and (recipes := asset_bundle.get_data('recipes')) is not None:
+            self._recipes = recipes.get('recipes', {})
+            return
         with open('assets/items/recipes.json', 'r', encoding='utf-8') as f:
             self._recipes = json.load(f).get('recipes', {})
        
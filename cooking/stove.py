@@ -3,6 +3,7 @@ from items.slot import InventorySlot
 import pygame
 from config import INPUTS
 from utils.asset_loader import asset_loader
+from utils.font_cache import font_cache
 from cooking.recipe_manager import recipe_manager
 from items.item_manager import item_manager
 
@@ -47,8 +48,8 @@ class StoveInterface:
         self.ingredient_slots = self.stove.ingredient_slots
         self.result_item = self.stove.result_slot
 
-        self.font = pygame.font.Font(None, _s(24))
-        self.small_font = pygame.font.Font(None, _s(14))
+        self.font = font_cache.get_font(None, _s(24))
+        self.small_font = font_cache.get_font(None, _s(14))
 
     def update(self, dt, game_time):
         if not self.is_open:
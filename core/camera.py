@@ -10,6 +10,14 @@ class Camera(pygame.sprite.Group):
         self.offset = vec()
         self.visible_window = pygame.Rect(0,0,WIN_WIDTH,WIN_HEIGHT)
         self.scene_size = self.get_scene_size(scene)
+
+        self.canvas = None
+        self.full_redraw = True
+        self.last_offset = None
+        self.queue_version = None
+        self.frame = {}
+        self.dirty_rects = []
+        self.overlay_rects = []
     def get_scene_size(self, scene):
         map_width = scene.tmx_data.width * scene.tmx_data.tilewidth
         map_height = scene.tmx_data.height * scene.tmx_data.tileheight
@@ -43,37 +51,126 @@ class Camera(pygame.sprite.Group):
 
         
     def draw(self,screen, group):
-        screen.fill(COLOURS['dark_gray'])
-        
-        dynamic_layers = ['objects', 'characters', 'interactive', 'decorations','windows']
-        
-        layer_order = {layer: i for i, layer in enumerate(LAYERS)}
+        if not DIRTY_RECTS:
+            self.render(screen, group, self.visible_window)
+            return
+
+        if self.canvas is None:
+            self.canvas = pygame.Surface(screen.get_size()).convert()
+
+        world_dirty = self.collect_dirty(group)
+        if world_dirty is None:
+            self.render(self.canvas, group, self.visible_window)
+            screen.blit(self.canvas, (0, 0))
+            self.dirty_rects = [screen.get_rect()]
+            return
+
+        for rect in world_dirty:
+            self.render(self.canvas, group, rect.move(int(self.offset.x), int(self.offset.y)))
+        self.canvas.set_clip(None)
+
+        self.dirty_rects = merge_rects(world_dirty + self.overlay_rects)
+        for rect in self.dirty_rects:
+            screen.blit(self.canvas, rect, rect)
+
+    def collect_dirty(self, group):
+        offset = (self.offset.x, self.offset.y)
+        full = (self.full_redraw or self.game.debug or offset != self.last_offset
+                or group.version != self.queue_version)
+        self.full_redraw = False
+        self.last_offset = offset
+        self.queue_version = group.version
+
+        screen_rect = self.canvas.get_rect()
+        dirty = []
+        frame = {}
+        for sprite in group.mobile:
+            rect = sprite.rect.move(-offset[0], -offset[1])
+            frame[sprite] = (sprite.image, rect)
+            if full:
+                continue
+            prev = self.frame.get(sprite)
+            if prev is None:
+                dirty.append(rect)
+            elif prev[0] is not sprite.image or prev[1] != rect:
+                dirty.append(prev[1].union(rect))
+        if not full:
+            for sprite, (_, rect) in self.frame.items():
+                if sprite not in frame:
+                    dirty.append(rect)
+        self.frame = frame
+
+        if full:
+            return None
+        return merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+
+    def present(self, overlay_rects):
+        # UI is drawn straight onto the screen, so last frame's overlay areas
+        # are restored from the canvas and both old and new areas are presented.
+        overlays = merge_rects([rect.clip(self.canvas.get_rect()) for rect in overlay_rects])
+        rects = self.dirty_rects + overlays
+        self.overlay_rects = overlays
+        self.dirty_rects = []
+        return rects
+
+    def invalidate(self):
+        self.full_redraw = True
+        if self.canvas is not None:
+            self.dirty_rects = [self.canvas.get_rect()]
+
+    def render(self, surface, group, window):
+        offset = self.offset
+        if window is not self.visible_window:
+            surface.set_clip(window.move(-int(offset.x), -int(offset.y)))
+        surface.fill(COLOURS['dark_gray'])
         
-        min_index = min(layer_order[layer] for layer in dynamic_layers if layer in layer_order)
+        static_layers = self.scene.room.static_layers
+        if static_layers:
+            static_layers.draw_below(surface, window, offset)
+
+        visible = group.in_order(self.scene.room.spatial_index.query_rect(window))
+        if not self.game.debug:
+            ox, oy = int(offset.x), int(offset.y)
+            surface.blits([(sprite.image, (sprite.rect.x - ox, sprite.rect.y - oy)) for sprite in visible], doreturn=False)
+        else:
+            self.render_debug(surface, visible)
+
+        if static_layers:
+            static_layers.draw_above(surface, window, offset)
+
+            if self.game.debug:
+                for collider in self.scene.room.static_colliders:
+                    if window.colliderect(collider.rect):
+                        self.hitbox_debugger(surface, collider)
+
+    def render_debug(self, surface, visible):
+        offset = self.offset
+        for sprite in visible:
+            surface.blit(sprite.image, sprite.rect.topleft - offset)
+
+            if hasattr(sprite, 'draw_debug'):
+                sprite.draw_debug(surface, offset)
+            elif sprite in self.scene.block_sprites:
+                self.hitbox_debugger(surface, sprite)
+                
+            if hasattr(sprite, 'draw_bubble'):
+                sprite.draw_bubble(surface, offset)
+
+            if hasattr(sprite, 'debug_target_pos') and sprite.debug_target_pos:
+                target_pos = sprite.debug_target_pos - offset
+                pygame.draw.circle(surface, (255, 0, 0), target_pos, 10)
 
-        def sort_key(sprite):
-            y_coord = sprite.rect.centery
-            
-            if sprite.z in dynamic_layers:
-                return (min_index, y_coord)
-            
-            layer_index = layer_order[sprite.z]
-            return (layer_index, y_coord)
-
-        for sprite in sorted(list(group), key=sort_key):
-            if self.visible_window.colliderect(sprite.rect):
-                offset_pos = sprite.rect.topleft - self.offset
-                screen.blit(sprite.image, offset_pos)
-
-                if self.game.debug:
-                    if hasattr(sprite, 'draw_debug'):
-                        sprite.draw_debug(screen, self.offset)
-                    elif sprite in self.scene.block_sprites:
-                        self.hitbox_debugger(screen, sprite)
-                        
-                    if hasattr(sprite, 'draw_bubble'):
-                        sprite.draw_bubble(screen, self.offset)
 
-                    if hasattr(sprite, 'debug_target_pos') and sprite.debug_target_pos:
-                        target_pos = sprite.debug_target_pos - self.offset
-                        pygame.draw.circle(screen, (255, 0, 0), target_pos, 10)
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
@@ -0,0 +1,64 @@
+import weakref
+import pygame
+from config import COLLISION_CELL_SIZE
+from utils.collision_grid import CollisionGrid
+
+OBJECTS, STATICS, NPCS, PLAYER = range(4)
+
+
+class CollisionWorld(pygame.sprite.AbstractGroup):
+    # Blockers of one room, kept for the room's lifetime. Ranks keep the
+    # objects, statics, npcs, player order block_sprites used to be built in.
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        super().__init__()
+        self.grid = CollisionGrid(cell_size)
+        self.ranks = weakref.WeakKeyDictionary()
+        self.player = None
+        self._counter = 0
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self._counter += 1
+        self.grid.add(sprite, (self.ranks.get(sprite, STATICS), self._counter))
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.discard(sprite)
+
+    def track(self, entity, rank):
+        # For entities that may start or stop blocking later; the entity calls
+        # refresh() when its blocking flag or collision shape changes.
+        self.ranks[entity] = rank
+        entity.collision_world = self
+        self.refresh(entity)
+
+    def untrack(self, entity):
+        self.remove(entity)
+        self.ranks.pop(entity, None)
+        entity.collision_world = None
+
+    def refresh(self, entity):
+        if not getattr(entity, 'is_blocking', False):
+            self.remove(entity)
+        elif entity in self:
+            self.grid.update(entity)
+        else:
+            self.add(entity)
+
+    def set_statics(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def set_player(self, player):
+        # The player always blocks guests, whatever its is_blocking flag says.
+        if self.player is not None:
+            self.remove(self.player)
+        self.player = player
+        self.ranks[player] = PLAYER
+        self.add(player)
+
+    def move(self, sprite):
+        self.grid.update(sprite)
+
+    def blockers_near(self, rect, exclude=None):
+        return self.grid.blockers_near(rect, exclude)
@@ -2,28 +2,50 @@ from typing import Optional
 import pygame
 import pygame.mask
 from core.game_time import game_time
+from core.timers import timers
+from core.path_service import path_service
 from cooking.stove import StoveInterface
 from items.slot import InventorySlot
 from ui.drag_manager import drag_manager
 from items.inventory import Inventory
 from cooking.recipe_manager import recipe_manager
 from config import *
+import math
 import random
-from utils.pathfinding import astar
+from utils.mask_cache import mask_cache
+
+
+def has_behaviour(component_type):
+    return component_type.update is not Component.update
 
 
 class Component:
+    __slots__ = ('entity', 'requires_game_time', 'dirty')
+
     def __init__(self):
         self.entity = None
         self.requires_game_time = False
+        # Set on mutation; StateComponent only snapshots dirty components.
+        self.dirty = True
     
     def on_add(self, entity):
         self.entity = entity
+
+    def link_siblings(self):
+        # Called whenever the entity gains a component, so references to
+        # siblings are resolved once instead of looked up every frame.
+        pass
+
+    def on_remove(self):
+        # Called when the entity leaves its room for good.
+        pass
     
     def update(self, dt):
         pass
 
 class SpriteComponent(Component):
+    __slots__ = ('image', 'layer', 'rect')
+
     def __init__(self, image, pos, layer = 'objects', colorkey = None):
         super().__init__()
         self.image = image
@@ -45,6 +67,8 @@ class SpriteComponent(Component):
         self.rect.topleft = value
 
 class CollisionComponent(Component):
+    __slots__ = ('hitbox', 'shrink_hitbox')
+
     def __init__(self, shrink_hitbox = True):
         super().__init__()
         self.hitbox = pygame.Rect(0, 0, 0, 0)
@@ -58,17 +82,26 @@ class CollisionComponent(Component):
                 self.hitbox.inflate_ip(-self.hitbox.width * HITBOX_SCALE_W, -self.hitbox.height * HITBOX_SCALE_H)
 
 class ShapedCollisionComponent(Component):
-    def __init__(self):
+    __slots__ = ('hitbox', 'mask', 'bounds')
+
+    def __init__(self, bounds=None):
         super().__init__()
         self.hitbox = None
         self.mask = None
+        self.bounds = bounds
 
     def on_add(self, entity):
         super().on_add(entity)
         sprite = self.entity.sprite
-        self.mask = pygame.mask.from_surface(sprite.image)
-        if self.mask.count():
-            bounds = self.mask.get_bounding_rects()[0]
+        if self.bounds is not None:
+            bounds = pygame.Rect(self.bounds)
+            if bounds:
+                self.hitbox = bounds.move(sprite.rect.topleft)
+            return
+        shape = mask_cache.get(sprite.image)
+        self.mask = shape.mask
+        if shape.count:
+            bounds = pygame.Rect(shape.bounds)
             if bounds:
                 self.hitbox = pygame.Rect(
                     bounds.x + sprite.rect.x,
@@ -78,6 +111,8 @@ class ShapedCollisionComponent(Component):
                 )
 
 class AnimationComponent(Component):
+    __slots__ = ('animations', 'current_animation', 'frame_duration', 'current_frame', 'time_accumulated', 'sprite_comp', 'move_comp')
+
     def __init__(self, animations, frame_duration = 0.1):
         super().__init__()
         self.animations = animations
@@ -91,6 +126,10 @@ class AnimationComponent(Component):
             self.current_animation = animation_name
             self.current_frame = 0
             self.time_accumulated = 0
+
+    def link_siblings(self):
+        self.sprite_comp = self.entity.get_component(SpriteComponent)
+        self.move_comp = self.entity.get_component(CharacterMovementComponent)
     
     def update(self, dt):
         if not self.current_animation or self.current_animation not in self.animations:
@@ -100,7 +139,7 @@ class AnimationComponent(Component):
         
         effective_frame_duration = self.frame_duration
         if 'walk' in self.current_animation:
-            if move_comp := self.entity.get_component(CharacterMovementComponent):
+            if move_comp := self.move_comp:
                 speed = move_comp.vel.length()
                 base_speed = move_comp.speed
                 if speed > 1.0 and base_speed > 0:
@@ -112,13 +151,19 @@ class AnimationComponent(Component):
             self.time_accumulated = 0
             self.current_frame = (self.current_frame + 1) % len(self.animations[self.current_animation])
             
-            sprite = self.entity.get_component(SpriteComponent)
+            sprite = self.sprite_comp
             if sprite:
                 current_anchor = sprite.rect.midbottom 
                 sprite.image = self.animations[self.current_animation][self.current_frame]
                 sprite.rect = sprite.image.get_rect(midbottom=current_anchor)
 
+    def advance(self, dt):
+        # Nothing in a hidden room is drawn; frames resume where they stopped.
+        pass
+
 class InteractionComponent(Component):
+    __slots__ = ('radius', 'can_interact', 'interaction_text')
+
     def __init__(self, radius = 60, text = "Нажмите E для взаимодействия"):
         super().__init__()
         self.radius = radius
@@ -140,12 +185,15 @@ class InteractionComponent(Component):
                 return
 
 class StateComponent(Component):
+    __slots__ = ('state',)
+
     def __init__(self, initial_state = None):
         super().__init__()
         self.state = initial_state or {}
         self.requires_game_time = True
 
     def get_state(self):
+        self.pull()
         return self.state.copy()
 
     def set_state(self, new_state):
@@ -154,24 +202,69 @@ class StateComponent(Component):
             if hasattr(component, 'load_state'):
                 component.load_state(self.state)
 
-    def update(self, dt):
+    def pull(self):
         if not self.entity: return
         for component in self.entity.components.values():
-            if hasattr(component, 'save_state'):
+            if component.dirty and hasattr(component, 'save_state'):
                 self.state.update(component.save_state())
+                component.dirty = False
+
+class TimedComponent(Component):
+    # Countdowns are deadlines in the game-time scheduler rather than floats
+    # decremented every frame. A running countdown keeps the component dirty
+    # so a save picks up the time left.
+    __slots__ = ('countdowns', 'changed')
+
+    def __init__(self):
+        self.countdowns = {}
+        super().__init__()
+
+    @property
+    def dirty(self):
+        return self.changed or bool(self.countdowns)
+
+    @dirty.setter
+    def dirty(self, value):
+        self.changed = value
+
+    def start_timer(self, name, delay, callback):
+        self.stop_timer(name)
+        def fire():
+            del self.countdowns[name]
+            self.changed = True
+            callback()
+        self.countdowns[name] = timers.schedule(delay, fire)
+
+    def stop_timer(self, name):
+        timer = self.countdowns.pop(name, None)
+        left = timers.remaining(timer)
+        timers.cancel(timer)
+        return left
+
+    def time_left(self, name):
+        return timers.remaining(self.countdowns.get(name))
+
+    def on_remove(self):
+        for name in list(self.countdowns):
+            self.stop_timer(name)
+
+class StoveComponent(TimedComponent):
+    __slots__ = ('energy_cost', 'cooking_cost', 'is_cooking', 'cooking_time', 'cooking_left',
+                 'fluid_amount', 'fluid_type', 'fluid_max_amount',
+                 'fluid_consumption_time', 'fluid_consumption_amount', 'cooking_interface', 'recipes',
+                 'current_recipe', 'ingredient_slots', 'result_slot', 'fuel_slot_item_id',
+                 'ingredients_changed', 'version', 'anim_comp', 'interaction_comp')
 
-class StoveComponent(Component):
     def __init__(self):
         super().__init__()
         self.energy_cost = 5
         self.cooking_cost = 15
         self.is_cooking = False
         self.cooking_time = 10
-        self.cooking_timer = 0
+        self.cooking_left = 0
         self.fluid_amount = 0
         self.fluid_type = 'wood'
         self.fluid_max_amount = 100
-        self.fluid_consumption_timer = 0
         self.fluid_consumption_time = 60
         self.fluid_consumption_amount = 1
         self.requires_game_time = True
@@ -182,29 +275,65 @@ class StoveComponent(Component):
         self.result_slot = InventorySlot()
         self.fuel_slot_item_id = None
         self.ingredients_changed = True
+        self.version = 0
+
+    def link_siblings(self):
+        self.anim_comp = self.entity.get_component(AnimationComponent)
+        self.interaction_comp = self.entity.get_component(InteractionComponent)
 
     @property
     def is_lit(self):
         return self.fluid_amount > 0
 
+    @property
+    def cooking_timer(self):
+        return self.time_left('cooking') if 'cooking' in self.countdowns else self.cooking_left
+
+    def _start_burning(self):
+        if self.is_lit and 'fuel' not in self.countdowns:
+            self.start_timer('fuel', self.fluid_consumption_time, self._burn)
+
+    def _burn(self):
+        if not self.is_lit: return
+        self.fluid_amount -= self.fluid_consumption_amount
+        if self.fluid_amount <= 0:
+            self.fluid_amount = 0
+            if self.is_cooking:
+                self.is_cooking = False
+                self.cooking_left = self.stop_timer('cooking')
+            if anim := self.anim_comp: anim.play('idle')
+        else:
+            self._start_burning()
+
+    def _finish_cooking(self):
+        self.is_cooking = False
+        self.cooking_left = 0
+        if self.current_recipe:
+            self.result_slot.item_id = self.current_recipe['result']
+            self.result_slot.amount = self.current_recipe.get('amount', 1)
+            self.current_recipe = None
+            self._sync_state()
+        if self.is_lit:
+            if anim := self.anim_comp: anim.play('lit')
+
     def add_fuel(self, amount, fuel_type = 'wood'):
         if fuel_type != self.fluid_type: return False
         if self.fluid_amount + amount <= self.fluid_max_amount:
             was_unlit = not self.is_lit
             self.fluid_amount += amount
             if was_unlit and self.is_lit:
-                if anim := self.entity.get_component(AnimationComponent):
+                if anim := self.anim_comp:
                     anim.play('lit')
+            self._start_burning()
             self.ingredients_changed = True
             self._sync_state()
             return True
         return False
 
     def _sync_state(self):
-        if self.entity:
-            if state_comp := self.entity.get_component(StateComponent):
-                state_comp.state.update(self.save_state())
+        self.dirty = True
         self.ingredients_changed = True
+        self.version += 1
 
     def _close_interface(self):
         if not self.cooking_interface: return
@@ -246,49 +375,29 @@ class StoveComponent(Component):
             if ingredient_counts == required_ingredients:
                 if player_stats.spend_energy(self.energy_cost):
                     self.is_cooking = True
-                    self.cooking_timer = recipe["cooking_time"]
+                    self.start_timer('cooking', recipe["cooking_time"], self._finish_cooking)
                     self.fluid_amount -= self.cooking_cost
                     self.current_recipe = {'id': recipe_id, **recipe}
                     for slot in self.ingredient_slots: slot.clear()
-                    if anim := self.entity.get_component(AnimationComponent): anim.play('cooking')
+                    if anim := self.anim_comp: anim.play('cooking')
                     self.ingredients_changed = True
                     self._sync_state()
                 return
 
     def update(self, dt):
+        # Fuel and cooking run on timers; only an open interface needs polling.
+        if not self.cooking_interface: return
         if not self.is_cooking: self.try_start_cooking()
-        
-        if self.is_lit:
-            self.fluid_consumption_timer += dt 
-            if self.fluid_consumption_timer >= self.fluid_consumption_time:
-                self.fluid_consumption_timer -= self.fluid_consumption_time
-                self.fluid_amount -= self.fluid_consumption_amount
-                if self.fluid_amount <= 0:
-                    self.fluid_amount = 0
-                    self.is_cooking = False
-                    if anim := self.entity.get_component(AnimationComponent): anim.play('idle')
-
-        if self.is_cooking:
-            self.cooking_timer -= dt 
-            if self.cooking_timer <= 0:
-                self.is_cooking = False
-                if self.current_recipe:
-                    self.result_slot.item_id = self.current_recipe['result']
-                    self.result_slot.amount = self.current_recipe.get('amount', 1)
-                    self.current_recipe = None
-                    self.ingredients_changed = True
-                    self._sync_state()
-                if self.is_lit:
-                    if anim := self.entity.get_component(AnimationComponent): anim.play('lit')
 
         if self.cooking_interface and self.cooking_interface.is_open:
             self.cooking_interface.update(dt, game_time)
             player = self.cooking_interface.player
             if player.inventory.visible: self._close_interface()
-            elif (comp := self.entity.get_component(InteractionComponent)) and \
+            elif (comp := self.interaction_comp) and \
                  pygame.math.Vector2(player.rect.center).distance_to(self.entity.rect.center) > comp.radius:
                 self._close_interface()
-        self.save_state()
+
+    advance = update
 
     def save_state(self):
         return {
@@ -302,24 +411,43 @@ class StoveComponent(Component):
     def load_state(self, state):
         self.is_cooking = state.get("is_cooking", False)
         self.fluid_amount = state.get("fluid_amount", 0)
-        self.cooking_timer = state.get("cooking_timer", 0)
+        self.cooking_left = state.get("cooking_timer", 0)
+        self.stop_timer('cooking')
+        if self.is_cooking:
+            self.start_timer('cooking', self.cooking_left, self._finish_cooking)
+        self.stop_timer('fuel')
+        self._start_burning()
         self.cooking_time = state.get("cooking_time", 10)
         self.ingredient_slots = [InventorySlot.from_dict(d) for d in state.get("ingredients", [])]
         while len(self.ingredient_slots) < 6: self.ingredient_slots.append(InventorySlot())
         self.result_slot = InventorySlot.from_dict(state.get("result", {}))
         self.fuel_slot_item_id = state.get("fuel_item")
         self.current_recipe = state.get("current_recipe")
-        if anim := self.entity.get_component(AnimationComponent):
+        self.version += 1
+        if anim := self.anim_comp:
             if self.is_cooking: anim.play('cooking') 
             elif self.is_lit: anim.play('lit')
             else: anim.play('idle')
 
 class StorageComponent(Component):
+    __slots__ = ('inventory', 'interacting_player', 'saved_version', 'interaction_comp')
+
     def __init__(self):
         super().__init__()
         self.inventory = Inventory(size=(6, 4), inventory_type='storage')
         self.interacting_player = None
 
+    @property
+    def dirty(self):
+        return self.inventory.version != self.saved_version
+
+    @dirty.setter
+    def dirty(self, value):
+        self.saved_version = None if value else self.inventory.version
+
+    def link_siblings(self):
+        self.interaction_comp = self.entity.get_component(InteractionComponent)
+
     @property
     def is_open(self):
         return self.inventory.visible
@@ -335,10 +463,12 @@ class StorageComponent(Component):
     
     def update(self, dt):
         if self.is_open and self.interacting_player:
-            if (comp := self.entity.get_component(InteractionComponent)) and \
+            if (comp := self.interaction_comp) and \
                pygame.math.Vector2(self.interacting_player.rect.center).distance_to(self.entity.rect.center) > comp.radius:
                     self.interact(self.interacting_player)
 
+    advance = update
+
     def save_state(self):
         return {"inventory": self.inventory.to_dict()}
 
@@ -346,43 +476,53 @@ class StorageComponent(Component):
         if inventory_data := state.get("inventory"):
             self.inventory.from_dict(inventory_data)
 
-class ToiletComponent(Component):
+class ToiletComponent(TimedComponent):
+    __slots__ = ('rest_amount', 'is_occupied', 'occupation_time')
+
     def __init__(self, rest_amount: int = TOILET_REST_AMOUNT):
         super().__init__()
         self.rest_amount = rest_amount
         self.is_occupied = False
-        self.occupation_timer = 0
         self.occupation_time = 5
         self.requires_game_time = True
 
+    @property
+    def occupation_timer(self):
+        return self.time_left('occupied')
+
     def interact(self, player):
         player_stats = player.get_component(PlayerStatsComponent)
         if not self.is_occupied and player_stats:
             player_stats.rest(self.rest_amount)
             self.is_occupied = True
-            self.occupation_timer = self.occupation_time
+            self.start_timer('occupied', self.occupation_time, self._vacate)
 
-    def update(self, dt):
-        if self.is_occupied:
-            self.occupation_timer -= dt 
-            if self.occupation_timer <= 0: self.is_occupied = False
+    def _vacate(self):
+        self.is_occupied = False
 
     def save_state(self):
         return {"is_occupied": self.is_occupied, "occupation_timer": self.occupation_timer}
 
     def load_state(self, state):
         self.is_occupied = state.get("is_occupied", False)
-        self.occupation_timer = state.get("occupation_timer", 0)
+        self.stop_timer('occupied')
+        if self.is_occupied:
+            self.start_timer('occupied', state.get("occupation_timer", 0), self._vacate)
+
+class BedComponent(TimedComponent):
+    __slots__ = ('rest_amount', 'is_used', 'cooldown')
 
-class BedComponent(Component):
     def __init__(self):
         super().__init__()
         self.rest_amount = BED_REST_AMOUNT
         self.is_used = False
         self.cooldown = 10  
-        self.cooldown_timer = 0
         self.requires_game_time = True
 
+    @property
+    def cooldown_timer(self):
+        return self.time_left('cooldown')
+
     def interact(self, player):
         if self.is_used:
             return
@@ -393,13 +533,10 @@ class BedComponent(Component):
             player_stats.rest(self.rest_amount)
         
         self.is_used = True
-        self.cooldown_timer = self.cooldown
+        self.start_timer('cooldown', self.cooldown, self._ready)
 
-    def update(self, dt):
-        if self.is_used:
-            self.cooldown_timer -= dt
-            if self.cooldown_timer <= 0:
-                self.is_used = False
+    def _ready(self):
+        self.is_used = False
 
     def save_state(self):
         return {
@@ -409,9 +546,13 @@ class BedComponent(Component):
 
     def load_state(self, state):
         self.is_used = state.get("is_used", False)
-        self.cooldown_timer = state.get("cooldown_timer", 0)
+        self.stop_timer('cooldown')
+        if self.is_used:
+            self.start_timer('cooldown', state.get("cooldown_timer", 0), self._ready)
 
 class TableComponent(Component):
+    __slots__ = ('is_used', 'items_on_table')
+
     def __init__(self):
         super().__init__()
         self.is_used = False
@@ -419,6 +560,7 @@ class TableComponent(Component):
 
     def interact(self, player):
         self.is_used = not self.is_used
+        self.dirty = True
 
     def save_state(self):
         return {"is_used": self.is_used, "items_on_table": self.items_on_table.copy()}
@@ -428,6 +570,8 @@ class TableComponent(Component):
         self.items_on_table = state.get("items_on_table", [])
 
 class ChairComponent(Component):
+    __slots__ = ('is_occupied', 'occupant', 'table_id')
+
     def __init__(self, table_id: Optional[str] = None):
         super().__init__()
         self.is_occupied = False
@@ -461,41 +605,52 @@ class ChairComponent(Component):
     def save_state(self): return {}
     def load_state(self, state): pass
 
-class WoodComponent(Component):
+class WoodComponent(TimedComponent):
+    __slots__ = ('is_used', 'cooldown', 'fuel_amount')
+
     def __init__(self):
         super().__init__()
         self.is_used = False
         self.cooldown = 60
-        self.cooldown_timer = 0
         self.fuel_amount = 20
         self.requires_game_time = True
 
+    @property
+    def cooldown_timer(self):
+        return self.time_left('cooldown')
+
     def interact(self, player):
         if not self.is_used and hasattr(player, 'inventory'):
             overflow = player.inventory.add_item('wood', amount=self.fuel_amount)
             if (self.fuel_amount - overflow) > 0:
                 self.is_used = True
-                self.cooldown_timer = self.cooldown
+                self.start_timer('cooldown', self.cooldown, self._ready)
 
-    def update(self, dt):
-        if self.is_used:
-            self.cooldown_timer -= dt 
-            if self.cooldown_timer <= 0: self.is_used = False
+    def _ready(self):
+        self.is_used = False
 
     def save_state(self):
         return {"is_used": self.is_used, "cooldown_timer": self.cooldown_timer}
 
     def load_state(self, state):
         self.is_used = state.get("is_used", False)
-        self.cooldown_timer = state.get("cooldown_timer", 0)
+        self.stop_timer('cooldown')
+        if self.is_used:
+            self.start_timer('cooldown', state.get("cooldown_timer", 0), self._ready)
 
 class PlayerControllerComponent(Component):
+    __slots__ = ('state_comp', 'move_comp')
+
     def __init__(self):
         super().__init__()
 
+    def link_siblings(self):
+        self.state_comp = self.entity.get_component(CharacterStateComponent)
+        self.move_comp = self.entity.get_component(CharacterMovementComponent)
+
     def update(self, dt):
-        if (state_comp := self.entity.get_component(CharacterStateComponent)) and state_comp.is_sitting(): return
-        if not (movement := self.entity.get_component(CharacterMovementComponent)): return
+        if (state_comp := self.state_comp) and state_comp.is_sitting(): return
+        if not (movement := self.move_comp): return
 
         move_direction = pygame.math.Vector2(
             INPUTS.get('right', 0) - INPUTS.get('left', 0),
@@ -525,12 +680,18 @@ class PlayerControllerComponent(Component):
                 break
 
 class AIControllerComponent(Component):
+    __slots__ = ('decision', 'state_comp', 'bubble_comp')
+
     def __init__(self):
         super().__init__()
-        self.decision_timer = random.uniform(NPC_IDLE_MIN_TIME, NPC_IDLE_MAX_TIME)
+        self.decision = None
+
+    def link_siblings(self):
+        self.state_comp = self.entity.get_component(CharacterStateComponent)
+        self.bubble_comp = self.entity.get_component(ThoughtBubbleComponent)
 
     def interact(self, player):
-        state_comp = self.entity.get_component(CharacterStateComponent)
+        state_comp = self.state_comp
         if not state_comp or not isinstance(state_comp.state, WaitingForFood):
             return
 
@@ -538,23 +699,33 @@ class AIControllerComponent(Component):
 
         ordered_item_id = state_comp.order[1]
         if player.inventory.remove_item(ordered_item_id, 1):
-            if bubble_comp := self.entity.get_component(ThoughtBubbleComponent):
+            if bubble_comp := self.bubble_comp:
                 bubble_comp.hide_bubble()
             
             state_comp.set_state(Eating(self.entity, ordered_item_id))
             state_comp.order = None
 
-    def update(self, dt):
-        state_comp = self.entity.get_component(CharacterStateComponent)
-        if not state_comp or not isinstance(state_comp.state, Idle):
-            self.decision_timer = random.uniform(NPC_IDLE_MIN_TIME, NPC_IDLE_MAX_TIME)
-            return
-            
-        self.decision_timer -= dt
-        if self.decision_timer <= 0:
+    def start_deciding(self):
+        # Idle guests look for a chair after a random wait; leaving Idle
+        # cancels the wait.
+        self.stop_deciding()
+        self.decision = timers.schedule(random.uniform(NPC_IDLE_MIN_TIME, NPC_IDLE_MAX_TIME), self._decide)
+
+    def stop_deciding(self):
+        timers.cancel(self.decision)
+        self.decision = None
+
+    def on_remove(self):
+        self.stop_deciding()
+
+    def _decide(self):
+        self.decision = None
+        if (state_comp := self.state_comp) and isinstance(state_comp.state, Idle):
             state_comp.set_state(FindingChair(self.entity))
             
 class CharacterStateComponent(Component):
+    __slots__ = ('state', 'initial_state_class', 'chair', 'order')
+
     def __init__(self, initial_state_class):
         super().__init__()
         self.state = None
@@ -568,17 +739,24 @@ class CharacterStateComponent(Component):
 
     def set_state(self, new_state_instance):
         if not self.state or self.state.__class__ != new_state_instance.__class__:
+            if self.state: self.state.exit()
             self.state = new_state_instance
+            new_state_instance.enter()
     
     def is_sitting(self):
         return isinstance(self.state, Sitting)
 
+    def on_remove(self):
+        if self.state: self.state.exit()
+
     def update(self, dt):
         if self.state:
             if new_state := self.state.update(dt):
                 self.set_state(new_state)
 
 class CharacterMovementComponent(Component):
+    __slots__ = ('speed', 'force', 'friction', 'acc', 'vel', 'move_direction', 'state_comp')
+
     def __init__(self, speed, force, friction):
         super().__init__()
         self.speed = speed
@@ -588,8 +766,11 @@ class CharacterMovementComponent(Component):
         self.vel = pygame.math.Vector2()
         self.move_direction = pygame.math.Vector2()
 
+    def link_siblings(self):
+        self.state_comp = self.entity.get_component(CharacterStateComponent)
+
     def movement(self):
-        state_comp = self.entity.get_component(CharacterStateComponent)
+        state_comp = self.state_comp
         if state_comp and state_comp.is_sitting():
             self.acc = pygame.math.Vector2(0, 0)
         else:
@@ -615,24 +796,36 @@ class CharacterMovementComponent(Component):
         self._collide('y')
         
         self.entity.rect.center = self.entity.hitbox.center
+        self.entity.scene.room.spatial_index.update(self.entity)
+        self.entity.scene.room.collision_world.move(self.entity)
 
     def update(self, dt):
         self.movement()
         self.physics(dt)
 
     def _collide(self, axis):
-        for sprite in self.entity.scene.block_sprites:
-            if sprite != self.entity and self.entity.hitbox.colliderect(sprite.hitbox):
-                if axis == 'x':
-                    if self.vel.x > 0: self.entity.hitbox.right = sprite.hitbox.left
-                    if self.vel.x < 0: self.entity.hitbox.left = sprite.hitbox.right
-                    self.vel.x = 0
-                if axis == 'y':
-                    if self.vel.y > 0: self.entity.hitbox.bottom = sprite.hitbox.top
-                    if self.vel.y < 0: self.entity.hitbox.top = sprite.hitbox.bottom
-                    self.vel.y = 0
+        hitbox = self.entity.hitbox
+        blockers = self.entity.scene.room.collision_world.blockers_near(hitbox, self.entity)
+        if not blockers:
+            return
+        # Once the first blocker zeroes the velocity later hits change nothing,
+        # so only the first one in block order needs resolving.
+        index = hitbox.collidelist([sprite.hitbox for sprite in blockers])
+        if index < 0:
+            return
+        sprite = blockers[index]
+        if axis == 'x':
+            if self.vel.x > 0: hitbox.right = sprite.hitbox.left
+            if self.vel.x < 0: hitbox.left = sprite.hitbox.right
+            self.vel.x = 0
+        if axis == 'y':
+            if self.vel.y > 0: hitbox.bottom = sprite.hitbox.top
+            if self.vel.y < 0: hitbox.top = sprite.hitbox.bottom
+            self.vel.y = 0
 
 class PlayerStatsComponent(Component):
+    __slots__ = ('max_energy', 'energy')
+
     def __init__(self):
         super().__init__()
         self.max_energy = PLAYER_STATE.get('max_energy', 100)
@@ -659,6 +852,18 @@ class PlayerStatsComponent(Component):
 
 
 class Entity(pygame.sprite.Sprite):
+    # Sprite already provides __dict__, which ad hoc attributes such as the
+    # player's inventory rely on; the slots cover the hot attributes.
+    __slots__ = ('components', 'id', 'active', '_is_blocking', 'scene', 'collision_world', 'world',
+                 'behaviours', 'sprite', 'collision', 'interaction', 'shaped_collision')
+
+    accessors = {
+        SpriteComponent: 'sprite',
+        CollisionComponent: 'collision',
+        InteractionComponent: 'interaction',
+        ShapedCollisionComponent: 'shaped_collision',
+    }
+
     def __init__(self, groups=None):
         super().__init__(groups) if groups else super().__init__()
         self.components = {}
@@ -666,6 +871,13 @@ class Entity(pygame.sprite.Sprite):
         self.active: bool = True
         self._is_blocking: bool = False
         self.scene = None
+        self.collision_world = None
+        self.world = None
+        self.behaviours = ()
+        self.sprite = None
+        self.collision = None
+        self.interaction = None
+        self.shaped_collision = None
 
     @property
     def is_blocking(self):
@@ -674,16 +886,9 @@ class Entity(pygame.sprite.Sprite):
     @is_blocking.setter
     def is_blocking(self, value):
         self._is_blocking = value
+        if self.collision_world is not None:
+            self.collision_world.refresh(self)
 
-    @property
-    def sprite(self): return self.get_component(SpriteComponent)
-    @property
-    def collision(self): return self.get_component(CollisionComponent)
-    @property
-    def interaction(self): return self.get_component(InteractionComponent)
-    @property
-    def shaped_collision(self): return self.get_component(ShapedCollisionComponent)
-    
     @property
     def rect(self):
         return self.sprite.rect if self.sprite else pygame.Rect(0, 0, 0, 0)
@@ -710,9 +915,25 @@ class Entity(pygame.sprite.Sprite):
     def z(self):
         return self.sprite.layer if self.sprite else 'objects'
 
+    def on_remove(self):
+        for component in self.components.values():
+            component.on_remove()
+
     def add_component(self, component):
         self.components[type(component)] = component
+        if accessor := self.accessors.get(type(component)):
+            setattr(self, accessor, component)
         component.on_add(self)
+        for sibling in self.components.values():
+            sibling.link_siblings()
+        if self.collision_world is not None and isinstance(component, (CollisionComponent, ShapedCollisionComponent)):
+            self.collision_world.refresh(self)
+        if has_behaviour(type(component)):
+            self.behaviours = tuple(sorted(
+                (c for c in self.components.values() if has_behaviour(type(c))),
+                key=lambda c: type(c) is CharacterStateComponent))
+        if self.world is not None:
+            self.world.refresh(self)
     
     def get_component(self, component_type):
         return self.components.get(component_type)
@@ -722,11 +943,8 @@ class Entity(pygame.sprite.Sprite):
 
     def update(self, dt):
         try:
-            state_comp = self.get_component(CharacterStateComponent)
-            for component in self.components.values():
-                if component != state_comp and hasattr(component, 'update'):
-                    component.update(dt)
-            if state_comp: state_comp.update(dt)
+            for component in self.behaviours:
+                component.update(dt)
         except Exception as e:
             print(f"Error updating entity {self.id}: {e}")
 
@@ -750,6 +968,21 @@ class BaseState:
         self.move_comp = self.entity.get_component(CharacterMovementComponent)
         if self.anim_comp: self.anim_comp.current_frame = 0
         self._last_direction = 'down'
+        self.timer = None
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        timers.cancel(self.timer)
+
+    def start_timer(self, delay, callback):
+        self.timer = timers.schedule(delay, callback)
+
+    def change_to(self, new_state):
+        state_comp = self.entity.get_component(CharacterStateComponent)
+        if state_comp and state_comp.state is self:
+            state_comp.set_state(new_state)
 
     def get_direction(self):
         if not self.move_comp or self.move_comp.vel.length_squared() == 0:
@@ -768,6 +1001,15 @@ class BaseState:
         raise NotImplementedError
 
 class Idle(BaseState):
+    def enter(self):
+        if ai := self.entity.get_component(AIControllerComponent):
+            ai.start_deciding()
+
+    def exit(self):
+        super().exit()
+        if ai := self.entity.get_component(AIControllerComponent):
+            ai.stop_deciding()
+
     def update(self, dt):
         if self.entity.get_component(PlayerControllerComponent):
             if self.move_comp and self.move_comp.vel.length_squared() > 4:
@@ -802,6 +1044,10 @@ class Sitting(BaseState):
                         angle = direction_vec.angle_to(pygame.math.Vector2(0, 1))
                         self._last_direction = ['down', 'right', 'up', 'left'][int(((angle + 360) % 360 + 45) / 90) % 4]
 
+    def enter(self):
+        if not self.entity.get_component(PlayerControllerComponent):
+            self.start_timer(self.sit_timer, lambda: self.change_to(Ordering(self.entity)))
+
     def update(self, dt):
         if self.entity.get_component(PlayerControllerComponent):
             if INPUTS.get('space'):
@@ -812,9 +1058,6 @@ class Sitting(BaseState):
                         chair_comp.vacate()
                     state_comp.chair = None
                 return Idle(self.entity)
-        else:
-            self.sit_timer -= dt
-            if self.sit_timer <= 0: return Ordering(self.entity)
 
         if self.anim_comp: self.anim_comp.play(f'idle_{self.get_direction()}', loop=False)
         return None
@@ -824,27 +1067,29 @@ class Ordering(BaseState):
         super().__init__(character)
         self.decision_timer = random.uniform(NPC_ORDERING_MIN_TIME, NPC_ORDERING_MAX_TIME)
 
-    def update(self, dt):
-        self.decision_timer -= dt
-        if self.decision_timer <= 0:
-            if not (orderable_recipes := recipe_manager.get_orderable_recipes()):
-                return Idle(self.entity)
-            
-            ordered_recipe_id = random.choice(list(orderable_recipes.keys()))
-            result_item_id = orderable_recipes[ordered_recipe_id].get('result', ordered_recipe_id)
-            
-            order = (self.entity, result_item_id, ordered_recipe_id)
-            
-            if state_comp := self.entity.get_component(CharacterStateComponent):
-                state_comp.order = order
+    def enter(self):
+        self.start_timer(self.decision_timer, lambda: self.change_to(self.place_order()))
 
-            if bubble_comp := self.entity.get_component(ThoughtBubbleComponent):
-                bubble_comp.show_bubble(result_item_id)
-
-            if hasattr(self.entity.scene.room, 'add_order'):
-                self.entity.scene.room.add_order(order)
-            return WaitingForFood(self.entity)
+    def place_order(self):
+        if not (orderable_recipes := recipe_manager.get_orderable_recipes()):
+            return Idle(self.entity)
+        
+        ordered_recipe_id = random.choice(list(orderable_recipes.keys()))
+        result_item_id = orderable_recipes[ordered_recipe_id].get('result', ordered_recipe_id)
         
+        order = (self.entity, result_item_id, ordered_recipe_id)
+        
+        if state_comp := self.entity.get_component(CharacterStateComponent):
+            state_comp.order = order
+
+        if bubble_comp := self.entity.get_component(ThoughtBubbleComponent):
+            bubble_comp.show_bubble(result_item_id)
+
+        if hasattr(self.entity.scene.room, 'add_order'):
+            self.entity.scene.room.add_order(order)
+        return WaitingForFood(self.entity)
+
+    def update(self, dt):
         if self.anim_comp: self.anim_comp.play(f'idle_{self.get_direction()}')
         return None
 
@@ -869,17 +1114,19 @@ class Eating(BaseState):
         if state_comp and state_comp.order and len(state_comp.order) > 2:
              recipe = recipe_manager.get_recipe(state_comp.order[2])
         self.eating_timer = (recipe.get('cooking_time', 5) if recipe else 5) * NPC_EATING_TIME
+
+    def enter(self):
+        self.start_timer(self.eating_timer, self.finish)
+
+    def finish(self):
+        state_comp = self.entity.get_component(CharacterStateComponent)
+        if state_comp and state_comp.chair:
+            if chair_comp := state_comp.chair.get_component(ChairComponent):
+                chair_comp.vacate()
+            state_comp.chair = None
+        self.change_to(Leaving(self.entity))
         
     def update(self, dt):
-        self.eating_timer -= dt
-        if self.eating_timer <= 0:
-            state_comp = self.entity.get_component(CharacterStateComponent)
-            if state_comp and state_comp.chair:
-                if chair_comp := state_comp.chair.get_component(ChairComponent):
-                    chair_comp.vacate()
-                state_comp.chair = None
-            return Leaving(self.entity)
-
         if self.anim_comp: self.anim_comp.play(f'idle_{self.get_direction()}', loop=False)
         return None
 
@@ -899,18 +1146,38 @@ class Leaving(BaseState):
         return None
 
 class FindingChair(BaseState):
+    # The path is searched by the path service; the guest idles here until
+    # its request is handed back and then walks it in MovingToTarget.
     def __init__(self, character):
         super().__init__(character)
+        self.request = None
+
+    def enter(self):
+        room = self.entity.scene.room
+        if not (free_chair := room.get_free_chair()):
+            return
+        if not (target_pos := room.find_target(free_chair)):
+            return
+        self.entity.target = free_chair
+        start_pos = (self.entity.rect.centerx // room.sub_tile_size, self.entity.rect.centery // room.sub_tile_size)
+        self.request = path_service.request(room, start_pos, target_pos)
+
+    def exit(self):
+        super().exit()
+        path_service.cancel(self.request)
 
     def update(self, dt):
-        if free_chair := self.entity.scene.room.get_free_chair():
-            self.entity.target = free_chair
-            return MovingToTarget(self.entity)
-        else:
+        if not self.request:
             return Idle(self.entity)
+        if not self.request.done:
+            if self.anim_comp: self.anim_comp.play(f'idle_{self.get_direction()}')
+            return None
+        if self.request.path:
+            return MovingToTarget(self.entity, self.request.path)
+        return Idle(self.entity)
 
 class MovingToTarget(BaseState):
-    def __init__(self, character):
+    def __init__(self, character, path=None):
         super().__init__(character)
         self.path = []
         state_comp = character.get_component(CharacterStateComponent)
@@ -921,20 +1188,21 @@ class MovingToTarget(BaseState):
             return
 
         room = character.scene.room
-        start_pos = (character.rect.centerx // room.sub_tile_size, character.rect.centery // room.sub_tile_size)
-        
-        target_pos = None
-        if hasattr(room, 'find_target'):
-            target_pos = room.find_target(character.target)
+        if path is None:
+            start_pos = (character.rect.centerx // room.sub_tile_size, character.rect.centery // room.sub_tile_size)
 
-        if not target_pos:
-            state_comp.set_state(Idle(character))
-            return
-            
+            target_pos = None
+            if hasattr(room, 'find_target'):
+                target_pos = room.find_target(character.target)
 
-        self.path = astar(room.grid, start_pos, target_pos)
-        if self.path:
-            self.path = [(x * room.sub_tile_size + room.sub_tile_size / 2, y * room.sub_tile_size + room.sub_tile_size / 2) for x, y in self.path]
+            if not target_pos:
+                state_comp.set_state(Idle(character))
+                return
+
+            path = room.find_path(start_pos, target_pos)
+
+        if path:
+            self.path = [(x * room.sub_tile_size + room.sub_tile_size / 2, y * room.sub_tile_size + room.sub_tile_size / 2) for x, y in path]
         else:
             state_comp.set_state(Idle(character))
 
@@ -971,6 +1239,8 @@ class MovingToTarget(BaseState):
         return Idle(self.entity)
 
 class ThoughtBubbleComponent(Component):
+    __slots__ = ('offset', 'item_id', 'visible', 'item_image')
+
     def __init__(self, offset=(0, -50)):
         super().__init__()
         self.offset = offset
@@ -987,4 +1257,126 @@ class ThoughtBubbleComponent(Component):
     def hide_bubble(self):
         self.visible = False
         self.item_id = None
-        self.item_image = None
\ No newline at end of file
+        self.item_image = None
+
+
+# Systems run component-major in this order. Within a single entity it keeps
+# the order Entity.update used: every behaviour first, character state last.
+SYSTEM_ORDER = [
+    AnimationComponent,
+    PlayerControllerComponent,
+    CharacterMovementComponent,
+    StoveComponent,
+    StorageComponent,
+    CharacterStateComponent,
+]
+
+
+class Archetype:
+    def __init__(self, signature):
+        self.signature = signature
+        self.entities = []
+        self.columns = {component_type: [] for component_type in signature if has_behaviour(component_type)}
+
+    def append(self, entity):
+        self.entities.append(entity)
+        for component_type, column in self.columns.items():
+            column.append(entity.components[component_type])
+        return len(self.entities) - 1
+
+    def swap_remove(self, row):
+        # Moves the last row into the hole so columns stay dense; returns the
+        # entity whose row changed, if any.
+        last = self.entities.pop()
+        for column in self.columns.values():
+            tail = column.pop()
+            if row < len(column):
+                column[row] = tail
+        if row < len(self.entities):
+            self.entities[row] = last
+            return last
+        return None
+
+
+class World:
+    def __init__(self):
+        self.archetypes = {}
+        self.rows = {}
+        self.schedule = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, entity):
+        return entity in self.rows
+
+    def add(self, entity):
+        if entity in self.rows:
+            self.refresh(entity)
+            return
+        signature = frozenset(entity.components)
+        archetype = self.archetypes.get(signature)
+        if archetype is None:
+            archetype = self.archetypes[signature] = Archetype(signature)
+            self._reschedule()
+        self.rows[entity] = (archetype, archetype.append(entity))
+        entity.world = self
+
+    def remove(self, entity):
+        location = self.rows.pop(entity, None)
+        if location is None:
+            return
+        archetype, row = location
+        moved = archetype.swap_remove(row)
+        if moved is not None:
+            self.rows[moved] = (archetype, row)
+        entity.world = None
+
+    def refresh(self, entity):
+        # Component set changed (or a component was replaced): migrate rows.
+        self.remove(entity)
+        self.add(entity)
+
+    def _reschedule(self):
+        types = {t for archetype in self.archetypes.values() for t in archetype.columns}
+        extra = [t for t in types if t not in SYSTEM_ORDER]
+        order = SYSTEM_ORDER[:-1] + sorted(extra, key=lambda t: t.__name__) + SYSTEM_ORDER[-1:]
+        self.schedule = [
+            (component_type, [a.columns[component_type] for a in self.archetypes.values() if component_type in a.columns])
+            for component_type in order if component_type in types
+        ]
+
+    def update(self, dt):
+        for component_type, columns in self.schedule:
+            for column in columns:
+                for component in column:
+                    try:
+                        component.update(dt)
+                    except Exception as e:
+                        print(f"Error updating entity {component.entity.id}: {e}")
+
+    def catch_up(self, dt, max_step):
+        # Components with an advance() take the whole span in one call; the
+        # rest (characters) are stepped no coarser than max_step.
+        stepped = []
+        for component_type, columns in self.schedule:
+            if not hasattr(component_type, 'advance'):
+                stepped.append((component_type, columns))
+                continue
+            for column in columns:
+                for component in column:
+                    try:
+                        component.advance(dt)
+                    except Exception as e:
+                        print(f"Error updating entity {component.entity.id}: {e}")
+        if not stepped:
+            return
+        steps = max(1, math.ceil(dt / max_step))
+        for _ in range(steps):
+            for component_type, columns in stepped:
+                for column in columns:
+                    for component in column:
+                        try:
+                            component.update(dt / steps)
+                        except Exception as e:
+                            print(f"Error updating entity {component.entity.id}: {e}")
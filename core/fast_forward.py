@@ -0,0 +1,86 @@
+import time
+import pygame
+from config import FAST_FORWARD_STEP, FAST_FORWARD_PROGRESS_INTERVAL, COLOURS, FONT, WIN_WIDTH
+from core.game_time import game_time
+from entities.room import room_manager
+from core.path_service import path_service
+from utils.font_cache import font_cache
+
+
+class FastForward:
+    # Runs the simulation without drawing, in fixed steps of game time (one
+    # second of dt is one game minute), until the span is used up or
+    # something the player should see happens.
+    def __init__(self, game, minutes, step=FAST_FORWARD_STEP, stop_on_order=True, progress=True):
+        self.game = game
+        self.minutes = minutes
+        self.step = step
+        self.stop_on_order = stop_on_order
+        self.progress = progress
+        self.font = font_cache.get_font(FONT, 32)
+
+    def _order_count(self):
+        return sum(len(getattr(room, 'orders', ())) for room in room_manager.rooms.values())
+
+    def _progress_frame(self, scene):
+        interrupted = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.game.running = False
+                interrupted = True
+            elif event.type == pygame.KEYDOWN:
+                interrupted = True
+
+        scene.draw(self.game.screen)
+        time_str, day = game_time.get_time_string()
+        self.game.render_text(f">> {time_str}", COLOURS['white'], self.font, (WIN_WIDTH / 2, 30))
+        pygame.display.flip()
+        return interrupted
+
+    def run(self):
+        game = self.game
+        scene = game.get_current_state()
+        game.reset_inputs()
+        orders = self._order_count()
+
+        simulated = 0
+        reason = 'done'
+        # Searches are made inline for the whole run: a worker would finish
+        # after a varying number of steps, and the same wait would play out
+        # differently from one machine to the next.
+        workers, path_service.workers = path_service.workers, 0
+        path_service.finish()
+        start = last_frame = time.perf_counter()
+        try:
+            while simulated < self.minutes:
+                dt = min(self.step, self.minutes - simulated)
+                game_time.update(dt)
+                room_manager.update_all_rooms(dt)
+                scene.update(dt)
+                simulated += dt
+
+                if game.get_current_state() is not scene:
+                    reason = 'scene'
+                    break
+                if self.stop_on_order and self._order_count() > orders:
+                    reason = 'order'
+                    break
+                if self.progress and (now := time.perf_counter()) - last_frame >= FAST_FORWARD_PROGRESS_INTERVAL:
+                    last_frame = now
+                    if self._progress_frame(scene):
+                        reason = 'interrupted'
+                        break
+        finally:
+            path_service.workers = workers
+
+        elapsed = time.perf_counter() - start
+        # The next regular frame must not see the wall time spent here as dt.
+        game.clock.tick()
+        if hasattr(scene, 'camera'):
+            scene.camera.invalidate()
+        return {
+            'minutes': simulated,
+            'seconds': elapsed,
+            'rate': simulated / elapsed if elapsed else 0.0,
+            'reason': reason,
+        }
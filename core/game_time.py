@@ -1,4 +1,5 @@
 from config import PLAYER_STATE
+from core.timers import timers
 
 class GameTimeManager:
     def __init__(self):
@@ -11,6 +12,7 @@ class GameTimeManager:
         ]
 
     def update(self, dt):
+        timers.advance(dt)
         self.minutes += dt 
         while self.minutes >= 60:
             self.minutes -= 60
@@ -31,6 +33,10 @@ class GameTimeManager:
         self.minutes = 0
         self.save_state()
 
+    def minutes_until(self, hour):
+        minutes = (hour - self.hours) % 24 * 60 - self.minutes
+        return minutes if minutes > 0 else minutes + 24 * 60
+
     def get_time_string(self):
         time_str = f"{int(self.hours):02}:{int(self.minutes):02}"
         return time_str, self.days_of_week[self.day]
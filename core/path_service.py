@@ -0,0 +1,117 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import PATH_WORKERS, PATH_RESULTS_PER_FRAME
+from utils.path_cache import MISS
+
+
+class PathRequest:
+    __slots__ = ('room', 'start', 'goal', 'version', 'future', 'path', 'done', 'cancelled', 'expanded', 'fields')
+
+    def __init__(self, room, start, goal):
+        self.room = room
+        self.start = start
+        self.goal = goal
+        self.version = room.grid_version
+        self.future = None
+        self.path = None
+        self.done = False
+        self.cancelled = False
+        self.expanded = 0
+        self.fields = {}
+
+
+class PathService:
+    # Searches run on worker threads and never block the frame. Finished
+    # requests are handed back on the main thread by update(), at most
+    # per_frame of them, so a rush of guests does not all start walking on
+    # one frame. The requester polls `done` and then reads `path`; a cache
+    # hit, or a search made inline with no workers, is done on return.
+    def __init__(self, workers=PATH_WORKERS, per_frame=PATH_RESULTS_PER_FRAME):
+        self.workers = workers
+        self.per_frame = per_frame
+        self.executor = None
+        self.pending = deque()
+
+    def request(self, room, start, goal):
+        request = PathRequest(room, start, goal)
+        if (path := room.path_cache.lookup(start, goal, request.version)) is not MISS:
+            request.path = path
+            request.done = True
+        else:
+            self._submit(request)
+        if not request.done:
+            self.pending.append(request)
+        return request
+
+    def cancel(self, request):
+        if request is not None:
+            request.cancelled = True
+            if request.future:
+                request.future.cancel()
+
+    def _submit(self, request):
+        room = request.room
+        request.version = room.grid_version
+        # The searcher is bound to the current grid and counts its expansions
+        # and keeps the flow fields it builds on the request, so the worker
+        # touches nothing the main thread uses.
+        search = room.searcher(request, request.fields)
+        if not self.workers:
+            request.path = search(request.start, request.goal)
+            self._store(request)
+            request.done = True
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='path')
+        request.future = self.executor.submit(search, request.start, request.goal)
+
+    def _store(self, request):
+        cache = request.room.path_cache
+        cache.expanded += request.expanded
+        request.expanded = 0
+        cache.store(request.start, request.goal, request.version, request.path)
+        fields, request.fields = request.fields, {}
+        if request.version == request.room.grid_version:
+            for goal, field in fields.items():
+                request.room.flow_fields.setdefault(goal, field)
+
+    def update(self):
+        applied = 0
+        waiting = deque()
+        while self.pending:
+            request = self.pending.popleft()
+            if request.cancelled:
+                continue
+            if applied >= self.per_frame or (request.future and not request.future.done()):
+                waiting.append(request)
+                continue
+            if request.future:
+                future, request.future = request.future, None
+                try:
+                    request.path = future.result()
+                except Exception as e:
+                    print(f"Error in path search: {e}")
+                    request.path = None
+                self._store(request)
+                if request.version != request.room.grid_version:
+                    # The grid was rebuilt while this was searched.
+                    self._submit(request)
+                    if not request.done:
+                        waiting.append(request)
+                        continue
+            request.done = True
+            applied += 1
+        self.pending = waiting
+
+    def finish(self):
+        # Blocks until every search in flight has ended, so the next update()
+        # hands them back no matter how fast the workers are.
+        wait([request.future for request in self.pending if request.future])
+
+    def clear(self):
+        for request in self.pending:
+            self.cancel(request)
+        self.pending.clear()
+
+
+path_service = PathService()
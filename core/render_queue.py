@@ -0,0 +1,72 @@
+from bisect import bisect_left
+import pygame
+from config import LAYERS, DYNAMIC_LAYERS
+from core.entity_component_system import AnimationComponent, CharacterMovementComponent
+
+
+class RenderQueue(pygame.sprite.AbstractGroup):
+    def __init__(self, *sprites):
+        super().__init__()
+        self.layer_order = {layer: i for i, layer in enumerate(LAYERS)}
+        self.sorted_index = min(self.layer_order[layer] for layer in DYNAMIC_LAYERS)
+        self.keys = []
+        self.ordered = []
+        self.sprite_keys = {}
+        self.mobile = {}
+        self._counter = 0
+        self.version = 0
+        self.add(*sprites)
+
+    def depth(self, sprite):
+        z = sprite.z
+        index = self.sorted_index if z in DYNAMIC_LAYERS else self.layer_order[z]
+        return index, sprite.rect.centery
+
+    def is_mobile(self, sprite):
+        has_component = getattr(sprite, 'has_component', None)
+        return bool(has_component) and (
+            has_component(CharacterMovementComponent) or has_component(AnimationComponent)
+        )
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self._counter += 1
+        self.version += 1
+        self._insert(sprite, (*self.depth(sprite), self._counter))
+        if self.is_mobile(sprite):
+            self.mobile[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.version += 1
+        self._remove(sprite)
+        self.mobile.pop(sprite, None)
+
+    def _insert(self, sprite, key):
+        index = bisect_left(self.keys, key)
+        self.keys.insert(index, key)
+        self.ordered.insert(index, sprite)
+        self.sprite_keys[sprite] = key
+
+    def _remove(self, sprite):
+        index = bisect_left(self.keys, self.sprite_keys.pop(sprite))
+        del self.keys[index]
+        del self.ordered[index]
+
+    def refresh(self):
+        for sprite in self.mobile:
+            key = self.sprite_keys[sprite]
+            depth = self.depth(sprite)
+            if depth[0] != key[0] or depth[1] != key[1]:
+                self._remove(sprite)
+                self._insert(sprite, (*depth, key[2]))
+
+    def in_order(self, sprites):
+        keys = self.sprite_keys
+        return sorted([sprite for sprite in sprites if sprite in keys], key=keys.__getitem__)
+
+    def sprites(self):
+        return list(self.ordered)
+
+    def __iter__(self):
+        return iter(self.ordered)
@@ -0,0 +1,149 @@
+import os
+import pickle
+import pygame
+from config import SCENE_CACHE_DIR, TILE_SIZE, NAV_GRID_SCALE
+from utils.asset_bundle import map_sources
+from utils.mask_cache import mask_cache
+
+CACHE_VERSION = 1
+WHITE = (255, 255, 255)
+SOLID_LAYERS = ('objects', 'walls', 'decorations')
+COLORKEYED_LAYERS = ('windows', 'cosmetics', 'decorations')
+
+
+class CompiledScene:
+    def __init__(self, width, height, layers, bounds, nav_grid):
+        self.width = width
+        self.height = height
+        self.layers = layers
+        self.bounds = bounds
+        self.nav_grid = nav_grid
+
+    def get_layer(self, name):
+        return next((payload for layer_name, payload in self.layers if layer_name == name), [])
+
+    def nav_rows(self):
+        width = self.width * NAV_GRID_SCALE
+        grid = self.nav_grid
+        return [list(grid[y:y + width]) for y in range(0, len(grid), width)]
+
+
+def compile_scene(tmx_data):
+    # Mirrors ObjectFactory.create_from_tmx_layers, including the colorkey
+    # changes earlier layers make to shared tile images, so the compiled
+    # placements match what the per-tile analysis used to produce.
+    names = [layer.name for layer in tmx_data.layers]
+    images = tmx_data.images
+    layers = []
+    bounds = {}
+    blockers = []
+
+    for layer in tmx_data.layers:
+        name = layer.name
+        if name in ('enteries', 'exits'):
+            layers.append((name, [(obj.name, obj.x, obj.y, obj.width, obj.height) for obj in layer]))
+            continue
+        if name not in ('background', 'lighting', *SOLID_LAYERS, *COLORKEYED_LAYERS):
+            continue
+
+        source = name
+        if name in ('objects', 'walls'):
+            source = 'walls' if 'walls' in names else 'objects'
+
+        tiles = []
+        for x, y, gid in tmx_data.get_layer_by_name(source).iter_data():
+            if not gid:
+                continue
+            image = images[gid]
+            if name in SOLID_LAYERS:
+                if not mask_cache.count(image):
+                    continue
+                if source == 'decorations':
+                    # SpriteComponent rekeys decoration tiles to white before
+                    # ShapedCollisionComponent sees them.
+                    image.set_colorkey(WHITE)
+                    key = ('decorations', gid)
+                    bounds[key] = mask_cache.bounds(image, converted=True)
+                else:
+                    key = ('objects', gid)
+                    bounds[key] = mask_cache.bounds(image)
+                box = pygame.Rect(bounds[key])
+                if box:
+                    box.move_ip(x * TILE_SIZE, y * TILE_SIZE)
+                else:
+                    box = image.get_rect(topleft=(x * TILE_SIZE, y * TILE_SIZE))
+                blockers.append(box)
+            elif name in COLORKEYED_LAYERS:
+                image.set_colorkey(WHITE)
+            tiles.append((x, y, gid))
+        layers.append((name, tiles))
+
+    width, height = tmx_data.width, tmx_data.height
+    return CompiledScene(width, height, layers, bounds, _nav_grid(width, height, blockers))
+
+
+def _nav_grid(width, height, blockers):
+    grid_width = width * NAV_GRID_SCALE
+    grid_height = height * NAV_GRID_SCALE
+    sub_tile_size = TILE_SIZE // NAV_GRID_SCALE
+    grid = bytearray(grid_width * grid_height)
+    for box in blockers:
+        start_x = max(box.left // sub_tile_size, 0)
+        end_x = min(box.right // sub_tile_size, grid_width)
+        for y in range(max(box.top // sub_tile_size, 0), min(box.bottom // sub_tile_size, grid_height)):
+            row = y * grid_width
+            grid[row + start_x:row + end_x] = b'\x01' * max(end_x - start_x, 0)
+    return bytes(grid)
+
+
+class SceneCache:
+    def __init__(self, directory=SCENE_CACHE_DIR):
+        self.directory = directory
+        self.scenes = {}
+
+    def path(self, scene_name):
+        return os.path.join(self.directory, f'{scene_name}.scene')
+
+    def settings(self):
+        return CACHE_VERSION, TILE_SIZE, NAV_GRID_SCALE
+
+    def load(self, scene_name, tmx_data):
+        if scene_name in self.scenes:
+            return self.scenes[scene_name]
+
+        compiled = self._read(scene_name) if self.directory else None
+        if compiled is None:
+            compiled = compile_scene(tmx_data)
+            if self.directory:
+                self._write(scene_name, compiled)
+        self.scenes[scene_name] = compiled
+        return compiled
+
+    def _read(self, scene_name):
+        try:
+            with open(self.path(scene_name), 'rb') as f:
+                data = pickle.load(f)
+            if data['settings'] != self.settings():
+                return None
+            for path, mtime in data['sources'].items():
+                if os.stat(path).st_mtime_ns != mtime:
+                    return None
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            return None
+        return CompiledScene(**data['scene'])
+
+    def _write(self, scene_name, compiled):
+        tmx_path = f'scenes/maps/{scene_name}.tmx'
+        try:
+            sources = {path: os.stat(path).st_mtime_ns for path in map_sources(tmx_path)}
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self.path(scene_name) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'settings': self.settings(), 'sources': sources, 'scene': vars(compiled)},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(scene_name))
+        except OSError as e:
+            print(f"Could not write scene cache for {scene_name}: {e}")
+
+
+scene_cache = SceneCache()
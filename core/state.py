@@ -1,8 +1,14 @@
 import pygame
 from config import *
 from core.camera import Camera
+from core.render_queue import RenderQueue
+from core.scene_cache import scene_cache
 from pytmx.util_pygame import load_pygame
 from core.transition import Transition
+from core.fast_forward import FastForward
+from core.game_time import game_time
+from ui.ui_manager import ui_manager
+from utils.font_cache import font_cache
 from entities.room import room_manager, TavernRoom, KitchenRoom, ToiletRoom, RestRoom, Room
 from entities.object_factory import ObjectFactory
 
@@ -23,13 +29,16 @@ class State:
     def draw(self,screen):
         pass
 
+    def get_dirty_rects(self, overlay_rects):
+        return None
+
 class MainMenu(State):
     def __init__(self, game):
         super().__init__(game)
         self.background_image = pygame.image.load('assets/ui/main_menu_background.png').convert()
         self.background_image = pygame.transform.scale(self.background_image, (WIN_WIDTH, WIN_HEIGHT))
 
-        self.button_font = pygame.font.Font(FONT, 32)
+        self.button_font = font_cache.get_font(FONT, 32)
         self.button_texts = ["Продолжить", "Новая Игра", "Выход"]
         self.button_enabled = [True, True, True]
         
@@ -94,22 +103,29 @@ class Scene(State):
         self.current_scene = current_scene
         self.entry_point = entry_point
         self.tmx_data = self.game.load_tmx(self.current_scene)
+        self.compiled = scene_cache.load(self.current_scene, self.tmx_data)
 
         self.drawn_sprites = pygame.sprite.Group()
         self.exit_sprites = pygame.sprite.Group()
-        self.block_sprites = pygame.sprite.Group()
         
         self.camera = Camera(self)
         self.transition = Transition(self)
         self.factory = ObjectFactory(self)
 
         self.room = self.setup_room()
+        self.block_sprites = self.room.collision_world
         self.player = self.factory.create_player()
+        self.block_sprites.set_player(self.player)
         self.target = self.player
         self.drawn_sprites.add(self.player)
         
         self.factory.create_from_tmx_layers()
         self.factory.create_from_room_data()
+        self.render_queue = RenderQueue(self.drawn_sprites, self.room.get_drawable_sprites())
+        self.room.rebuild_spatial_index(self.player)
+        # Last, so guests spawned while the room catches up land in the
+        # render queue and spatial index.
+        room_manager.activate(self.room)
         
     def get_sprite_groups(self):
         return [self.drawn_sprites, self.block_sprites]
@@ -141,26 +157,33 @@ class Scene(State):
         )
 
     def recreate_room_objects(self):
-        self.room.objects.clear()
+        self.render_queue.remove(self.room.objects)
+        self.room.clear_objects()
         self.factory.create_from_room_data()
+        self.render_queue.add(self.room.objects)
 
     def update(self, dt):
+        if INPUTS.get('wait'):
+            INPUTS['wait'] = False
+            result = FastForward(self.game, game_time.minutes_until(FAST_FORWARD_UNTIL_HOUR)).run()
+            if notice := FAST_FORWARD_NOTICES.get(result['reason']):
+                ui_manager.notify(notice)
+            return
+
         self.player.inventory.update()
-        self.drawn_sprites.update(dt)
+        # Guests share drawn_sprites for rendering but are ticked by their room.
+        self.player.update(dt)
         self.camera.update(dt, self.target)
         self.transition.update(dt)
-
-        if self.room:
-            self.room.update(dt)
-        
-            self.block_sprites.empty()
-            self.block_sprites.add(self.room.get_blocking_sprites())
-            self.block_sprites.add(self.player)
-            
         
     def draw(self, screen):
-        all_sprites = list(self.drawn_sprites) + self.room.get_drawable_sprites()
-        self.camera.draw(screen, all_sprites)
-        self.transition.draw(screen)
+        self.render_queue.refresh()
+        self.camera.draw(screen, self.render_queue)
+        if self.transition.alpha > 0:
+            self.transition.draw(screen)
+            self.camera.invalidate()
+
+    def get_dirty_rects(self, overlay_rects):
+        return self.camera.present(overlay_rects)
         
  
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pygame
+
+
+class StaticCollider(pygame.sprite.Sprite):
+    def __init__(self, rect):
+        super().__init__()
+        self.rect = rect
+        self.hitbox = rect
+        self.is_blocking = True
+
+
+def _runs(rects, start, length, band):
+    # Joins rects that share the same band and touch end to end along the
+    # other axis into single runs.
+    bands = {}
+    for rect in rects:
+        bands.setdefault(band(rect), []).append(rect)
+
+    runs = []
+    for group in bands.values():
+        group.sort(key=start)
+        current = group[0].copy()
+        for rect in group[1:]:
+            if start(rect) == start(current) + length(current):
+                current.union_ip(rect)
+            else:
+                runs.append(current)
+                current = rect.copy()
+        runs.append(current)
+    return runs
+
+
+def mesh_colliders(rects):
+    # Greedy meshing: horizontal runs first, then stack runs with identical
+    # column spans. Only exactly aligned rects are joined, so a character
+    # sliding along a wall stops at the same edge as it did per tile.
+    unique = [pygame.Rect(rect) for rect in dict.fromkeys(tuple(rect) for rect in rects)]
+    rows = _runs(unique, lambda r: r.x, lambda r: r.width, lambda r: (r.y, r.height))
+    columns = _runs(rows, lambda r: r.y, lambda r: r.height, lambda r: (r.x, r.width))
+    return sorted(columns, key=lambda r: (r.y, r.x))
+
+
+def build_static_colliders(statics):
+    rects = [sprite.hitbox for sprite in statics if getattr(sprite, 'is_blocking', False)]
+    return [StaticCollider(rect) for rect in mesh_colliders(rects)] if rects else []
@@ -0,0 +1,99 @@
+import pygame
+from config import LAYERS, DYNAMIC_LAYERS, STATIC_CHUNK_SIZE
+
+
+class StaticChunk(pygame.sprite.Sprite):
+    def __init__(self, image, rect, layer):
+        super().__init__()
+        self.image = image
+        self.rect = rect
+        self.layer = layer
+
+    @property
+    def z(self):
+        return self.layer
+
+
+class StaticLayerCache:
+    def __init__(self, entities, chunk_size=STATIC_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.layer_order = {layer: i for i, layer in enumerate(LAYERS)}
+        self.sorted_index = min(self.layer_order[layer] for layer in DYNAMIC_LAYERS)
+        self.below = []
+        self.above = []
+        self.sorted_chunks = []
+        self.bake(entities)
+
+    def bake(self, entities):
+        layers = {}
+        rows = {}
+        for entity in entities:
+            if entity.z in DYNAMIC_LAYERS:
+                rows.setdefault(entity.rect.centery, []).append(entity)
+            else:
+                layers.setdefault(self.layer_order[entity.z], []).append(entity)
+
+        for index in sorted(layers):
+            group = sorted(layers[index], key=lambda entity: entity.rect.centery)
+            chunks = self._bake_grid(group, LAYERS[index])
+            if index < self.sorted_index:
+                self.below.append(chunks)
+            else:
+                self.above.append(chunks)
+
+        # Y-sorted tiles share one depth key per row, so a baked row strip
+        # interleaves with characters exactly like the individual tiles did.
+        for centery in sorted(rows):
+            self.sorted_chunks.extend(self._bake_row(rows[centery]))
+
+    def _bake_grid(self, group, layer):
+        size = self.chunk_size
+        buckets = {}
+        for entity in group:
+            rect = entity.rect
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                    buckets.setdefault((cx, cy), []).append(entity)
+
+        chunks = {}
+        for (cx, cy), members in buckets.items():
+            area = pygame.Rect(cx * size, cy * size, size, size)
+            chunks[(cx, cy)] = self._render(members, area, layer)
+        return chunks
+
+    def _bake_row(self, group):
+        size = self.chunk_size
+        bounds = group[0].rect.unionall([entity.rect for entity in group[1:]])
+        chunks = []
+        for left in range(bounds.left - bounds.left % size, bounds.right, size):
+            column = pygame.Rect(left, bounds.top, size, bounds.height)
+            members = [entity for entity in group if column.colliderect(entity.rect)]
+            if not members:
+                continue
+            area = members[0].rect.unionall([entity.rect for entity in members[1:]]).clip(column)
+            chunks.append(self._render(members, area, group[0].z))
+        return chunks
+
+    def _render(self, members, area, layer):
+        surface = pygame.Surface(area.size, pygame.SRCALPHA)
+        for entity in members:
+            surface.blit(entity.image, (entity.rect.x - area.x, entity.rect.y - area.y))
+        return StaticChunk(surface, area, layer)
+
+    def draw_below(self, screen, visible_window, offset):
+        for chunks in self.below:
+            self._draw_chunks(screen, chunks, visible_window, offset)
+
+    def draw_above(self, screen, visible_window, offset):
+        for chunks in self.above:
+            self._draw_chunks(screen, chunks, visible_window, offset)
+
+    def _draw_chunks(self, screen, chunks, visible_window, offset):
+        size = self.chunk_size
+        ox, oy = int(offset.x), int(offset.y)
+        batch = []
+        for cy in range(visible_window.top // size, (visible_window.bottom - 1) // size + 1):
+            for cx in range(visible_window.left // size, (visible_window.right - 1) // size + 1):
+                if chunk := chunks.get((cx, cy)):
+                    batch.append((chunk.image, (chunk.rect.x - ox, chunk.rect.y - oy)))
+        screen.blits(batch, doreturn=False)
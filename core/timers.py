@@ -0,0 +1,72 @@
+import heapq
+import itertools
+
+
+class Timer:
+    __slots__ = ('deadline', 'callback', 'active')
+
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.active = True
+
+
+class TimerScheduler:
+    # Deadlines are in the same seconds GameTimeManager.update advances by, so
+    # a countdown that used to be decremented by dt every frame fires at the
+    # same moment without being polled.
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self.heap if timer.active)
+
+    def schedule(self, delay, callback):
+        timer = Timer(self.now + delay, callback)
+        heapq.heappush(self.heap, (timer.deadline, next(self.sequence), timer))
+        return timer
+
+    def cancel(self, timer):
+        # Cancelled entries stay in the heap and are skipped when they surface;
+        # dropping the callback lets whatever it closes over be freed now.
+        if timer is not None:
+            timer.active = False
+            timer.callback = None
+
+    def remaining(self, timer):
+        if timer is None or not timer.active:
+            return 0
+        return timer.deadline - self.now
+
+    def next_deadline(self):
+        heap = self.heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def advance(self, dt):
+        # Due timers fire in deadline order with `now` set to their deadline,
+        # so callbacks that reschedule themselves stay exact across long spans.
+        target = self.now + dt
+        heap = self.heap
+        while heap and heap[0][0] <= target:
+            deadline, _, timer = heapq.heappop(heap)
+            if not timer.active:
+                continue
+            timer.active = False
+            self.now = deadline
+            try:
+                timer.callback()
+            except Exception as e:
+                print(f"Error in timer callback: {e}")
+        self.now = target
+
+    def clear(self):
+        for _, _, timer in self.heap:
+            timer.active = False
+        self.heap.clear()
+
+
+timers = TimerScheduler()
@@ -17,6 +17,8 @@ class Transition:
         else:
             self.alpha = max(0, self.alpha - self.fade_speed * dt)
     def draw(self,screen):
+        if self.alpha <= 0:
+            return
         self.fade_surf.fill((COLOURS['black']))
         self.fade_surf.set_alpha(self.alpha)
         screen.blit(self.fade_surf, (0,0))
\ No newline at end of file
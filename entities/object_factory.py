@@ -11,14 +11,22 @@ from core.entity_component_system import (
 from config import *
 from items.inventory import Inventory
 from utils.asset_loader import asset_loader
+from core.static_layers import StaticLayerCache
+from core.static_colliders import build_static_colliders
 
 
 class InteractionSystem:
     def __init__(self, scene):
         self.scene = scene
 
-    def get_nearest_interactive_object(self, position):
-        interactive_sprites = self.scene.room.get_interactive_sprites()
+    def get_nearest_interactive_object(self, position, radius=None):
+        if radius is None:
+            interactive_sprites = self.scene.room.get_interactive_sprites()
+        else:
+            interactive_sprites = [
+                obj for obj in self.scene.room.spatial_index.query_radius(position, radius)
+                if hasattr(obj, 'has_component') and obj.has_component(InteractionComponent)
+            ]
         if not interactive_sprites:
             return None
 
@@ -31,11 +39,11 @@ class InteractionSystem:
             return None
 
     def interact_with_nearest(self, player_entity):
-        nearest_obj = self.get_nearest_interactive_object(player_entity.rect.center)
+        interaction_distance = TILE_SIZE * INTERACTION_DISTANCE
+        nearest_obj = self.get_nearest_interactive_object(player_entity.rect.center, interaction_distance)
         if not nearest_obj:
             return
 
-        interaction_distance = TILE_SIZE * INTERACTION_DISTANCE
         distance = pygame.math.Vector2(player_entity.rect.center).distance_to(nearest_obj.rect.center)
 
         if distance < interaction_distance:
@@ -120,6 +128,7 @@ class ObjectFactory:
         guest_entity.is_blocking = False
 
         self.scene.drawn_sprites.add(guest_entity)
+        self.scene.render_queue.add(guest_entity)
 
         return guest_entity
 
@@ -135,9 +144,13 @@ class ObjectFactory:
             'enteries': self.generate_enteries,
             'exits': self.generate_exits
         }
-        for layer in self.tmx_data.layers:
-            if layer.name in layer_handlers:
-                layer_handlers[layer.name]()
+        room = self.scene.room
+        room.statics.clear()
+        for name, payload in self.scene.compiled.layers:
+            if name in layer_handlers:
+                layer_handlers[name](payload)
+        room.static_layers = StaticLayerCache(room.statics)
+        room.set_static_colliders(build_static_colliders(room.statics))
 
     def create_from_room_data(self):
         room = self.scene.room
@@ -151,7 +164,7 @@ class ObjectFactory:
             saved_state = room.saved_state.get(obj_id, {})
             entity = self.create_interactive_entity(obj_type, obj_data, saved_state)
             if entity:
-                room.objects.append(entity)
+                room.add_object(entity)
 
     def create_interactive_entity(self, obj_type, obj_data, saved_state):
         position = (obj_data.get("x", 0), obj_data.get("y", 0))
@@ -248,60 +261,64 @@ class ObjectFactory:
         entity.add_component(StateComponent())
         return entity
 
-    def _create_basic_entity(self, pos, image, layer, use_collision=False, shaped_collision=False, colorkey=None):
+    def _create_basic_entity(self, pos, image, layer, use_collision=False, shaped_collision=False, colorkey=None, bounds=None):
         entity = Entity()
         entity.is_blocking = use_collision
         sprite = SpriteComponent(image, pos, layer, colorkey)
         entity.add_component(sprite)
         if use_collision:
-            entity.add_component(ShapedCollisionComponent() if shaped_collision else CollisionComponent())
+            entity.add_component(ShapedCollisionComponent(bounds) if shaped_collision else CollisionComponent())
         return entity
+
+    def _tiles(self, tiles):
+        images = self.tmx_data.images
+        for x, y, gid in tiles:
+            yield (x*TILE_SIZE, y*TILE_SIZE), images[gid], gid
         
-    def generate_background(self):
-        for x, y, image in self.tmx_data.get_layer_by_name("background").tiles():
-            entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'background')
+    def generate_background(self, tiles):
+        for pos, image, _ in self._tiles(tiles):
+            entity = self._create_basic_entity(pos, image, 'background')
             self.scene.room.statics.append(entity)
     
-    def generate_cosmetics(self):
-        for x, y, image in self.tmx_data.get_layer_by_name("cosmetics").tiles():
-            entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'objects', colorkey=(255, 255, 255))
+    def generate_cosmetics(self, tiles):
+        for pos, image, _ in self._tiles(tiles):
+            entity = self._create_basic_entity(pos, image, 'objects', colorkey=(255, 255, 255))
             self.scene.room.statics.append(entity)
     
-    def generate_objects(self):
-        layer_name = "walls" if "walls" in [layer.name for layer in self.tmx_data.layers] else "objects"
-        for x, y, image in self.tmx_data.get_layer_by_name(layer_name).tiles():
-            if pygame.mask.from_surface(image).count() > 0:
-                entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'objects', use_collision=True, shaped_collision=True)
-                self.scene.room.statics.append(entity)
+    def generate_objects(self, tiles):
+        bounds = self.scene.compiled.bounds
+        for pos, image, gid in self._tiles(tiles):
+            entity = self._create_basic_entity(pos, image, 'objects', use_collision=True, shaped_collision=True, bounds=bounds[('objects', gid)])
+            self.scene.room.statics.append(entity)
     
-    def generate_lighting(self):
-        for x, y, image in self.tmx_data.get_layer_by_name("lighting").tiles():
-            entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'lighting')
+    def generate_lighting(self, tiles):
+        for pos, image, _ in self._tiles(tiles):
+            entity = self._create_basic_entity(pos, image, 'lighting')
             self.scene.room.statics.append(entity)
     
-    def generate_windows(self):
-        for x, y, image in self.tmx_data.get_layer_by_name("windows").tiles():
+    def generate_windows(self, tiles):
+        for pos, image, _ in self._tiles(tiles):
             image.set_colorkey((255, 255, 255))
-            entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'windows')
+            entity = self._create_basic_entity(pos, image, 'windows')
             self.scene.room.statics.append(entity)
     
-    def generate_decorations(self):
-        for x, y, image in self.tmx_data.get_layer_by_name('decorations').tiles():
-            if pygame.mask.from_surface(image).count() > 0:
-                entity = self._create_basic_entity((x*TILE_SIZE, y*TILE_SIZE), image, 'decorations', use_collision=True, shaped_collision=True, colorkey=(255, 255, 255))
-                self.scene.room.statics.append(entity)
+    def generate_decorations(self, tiles):
+        bounds = self.scene.compiled.bounds
+        for pos, image, gid in self._tiles(tiles):
+            entity = self._create_basic_entity(pos, image, 'decorations', use_collision=True, shaped_collision=True, colorkey=(255, 255, 255), bounds=bounds[('decorations', gid)])
+            self.scene.room.statics.append(entity)
     
-    def generate_enteries(self):
-        for obj in self.tmx_data.get_layer_by_name("enteries"):
-            if obj.name == self.scene.entry_point:
-                self.scene.player.position = (obj.x, obj.y)
+    def generate_enteries(self, entries):
+        for name, x, y, _, _ in entries:
+            if name == self.scene.entry_point:
+                self.scene.player.position = (x, y)
                 if self.scene.player.hitbox:
                     self.scene.player.hitbox.center = self.scene.player.rect.center
                 
-    def generate_exits(self):
-        for obj in self.tmx_data.get_layer_by_name("exits"):
+    def generate_exits(self, exits):
+        for name, x, y, width, height in exits:
             entity = Entity([self.scene.exit_sprites])
-            exit_surface = pygame.Surface((obj.width, obj.height), pygame.SRCALPHA)
-            entity.add_component(SpriteComponent(exit_surface, (obj.x, obj.y)))
+            exit_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            entity.add_component(SpriteComponent(exit_surface, (x, y)))
             entity.add_component(CollisionComponent(shrink_hitbox=False))
-            entity.name = obj.name
+            entity.name = name
\ No newline at end of file
@@ -1,8 +1,16 @@
 import json
 from core.game_time import game_time
-from core.entity_component_system import StateComponent, ChairComponent, Leaving, CharacterStateComponent, AIControllerComponent
+from core.entity_component_system import StateComponent, ChairComponent, Leaving, CharacterStateComponent, AIControllerComponent, World
 import random
-from config import TILE_SIZE, NPC_SPAWN_MIN_CUSTOMERS, NPC_SPAWN_INTERVAL
+from config import TILE_SIZE, NPC_SPAWN_MIN_CUSTOMERS, NPC_SPAWN_INTERVAL, SPATIAL_CELL_SIZE, NAV_GRID_SCALE, \
+    HIDDEN_ROOM_INTERVAL, HIDDEN_ROOM_MAX_STEP, NAVIGATION_MODE, PATH_CACHE_SIZE, HPA_CLUSTER_SIZE
+from utils.pathfinding import astar, flatten_grid
+from utils.flow_field import FlowField
+from utils.hpa import ClusterGraph
+from utils.path_cache import PathCache
+from core.path_service import path_service
+from utils.spatial_hash import SpatialHash
+from core.collision_world import CollisionWorld, OBJECTS, NPCS
 
 class Room:
     def __init__(self, json_path, scene):
@@ -13,7 +21,13 @@ class Room:
         self.saved_state = self.data["saved_state"]
         self.objects = []
         self.statics = []
+        self.static_layers = None
+        self.static_colliders = []
         self.npcs = []
+        self.spatial_index = SpatialHash(SPATIAL_CELL_SIZE)
+        self.collision_world = CollisionWorld()
+        self.world = World()
+        self.pending_time = 0
         
         self.load_levels_undo()
 
@@ -54,10 +68,48 @@ class Room:
 
         self.scene.recreate_room_objects()
         
-    def get_blocking_sprites(self):
-        return [obj for obj in self.objects if getattr(obj, 'is_blocking', False)] + \
-               [s for s in self.statics if getattr(s, 'is_blocking', False)] + \
-               [npc for npc in self.npcs if getattr(npc, 'is_blocking', False)]
+    def add_object(self, entity):
+        self.objects.append(entity)
+        self.spatial_index.insert(entity)
+        self.collision_world.track(entity, OBJECTS)
+        self.world.add(entity)
+
+    def clear_objects(self):
+        for obj in self.objects:
+            self.spatial_index.remove(obj)
+            self.collision_world.untrack(obj)
+            self.world.remove(obj)
+            obj.on_remove()
+        self.objects.clear()
+
+    def add_npc(self, entity):
+        self.npcs.append(entity)
+        self.spatial_index.insert(entity)
+        self.collision_world.track(entity, NPCS)
+        self.world.add(entity)
+
+    def prune_npcs(self):
+        alive = []
+        for npc in self.npcs:
+            if npc.alive():
+                alive.append(npc)
+            else:
+                self.spatial_index.remove(npc)
+                self.collision_world.untrack(npc)
+                self.world.remove(npc)
+                npc.on_remove()
+        self.npcs = alive
+
+    def set_static_colliders(self, colliders):
+        self.collision_world.set_statics(self.static_colliders, colliders)
+        self.static_colliders = colliders
+
+    def rebuild_spatial_index(self, *extra):
+        self.spatial_index.clear()
+        for sprite in self.get_drawable_sprites():
+            self.spatial_index.insert(sprite)
+        for sprite in extra:
+            self.spatial_index.insert(sprite)
 
     def get_interactive_sprites(self):
         from core.entity_component_system import InteractionComponent
@@ -65,21 +117,22 @@ class Room:
                [npc for npc in self.npcs if npc.has_component(InteractionComponent)]
                
     def get_drawable_sprites(self):
+        if self.static_layers:
+            return self.objects + self.npcs + self.static_layers.sorted_chunks
         return self.objects + self.npcs + self.statics
 
-    def update(self, dt):
-        for obj in self.objects:
-            if hasattr(obj, 'update'):
-                obj.update(dt)
-        for npc in self.npcs:
-            if hasattr(npc, 'update'):
-                npc.update(dt)
+    def update(self, dt, catch_up=False):
+        if catch_up:
+            self.world.catch_up(dt, HIDDEN_ROOM_MAX_STEP)
+        else:
+            self.world.update(dt)
 
     
 
 class RoomManager:
     def __init__(self):
         self.rooms = {}
+        self.active_room = None
 
     def get_room(self, json_path, scene, room_class):
         if json_path in self.rooms:
@@ -91,9 +144,23 @@ class RoomManager:
         self.rooms[json_path] = room
         return room
 
+    def activate(self, room):
+        # Bring a hidden room up to date before it is ticked every frame again.
+        if room.pending_time:
+            room.update(room.pending_time, catch_up=True)
+            room.pending_time = 0
+        self.active_room = room
+
     def update_all_rooms(self, dt):
+        path_service.update()
         for room in self.rooms.values():
-            room.update(dt)
+            if room is self.active_room:
+                room.update(dt)
+                continue
+            room.pending_time += dt
+            if room.pending_time >= HIDDEN_ROOM_INTERVAL:
+                room.update(room.pending_time, catch_up=True)
+                room.pending_time = 0
 
 room_manager = RoomManager()
 
@@ -103,15 +170,20 @@ class TavernRoom(Room):
         self.orders = []
         
         self.spawn_points = []
-        for obj in self.scene.tmx_data.get_layer_by_name("enteries"):
-            if obj.name == "enter":
-                self.spawn_points.append((obj.x, obj.y))
+        for name, x, y, _, _ in self.scene.compiled.get_layer("enteries"):
+            if name == "enter":
+                self.spawn_points.append((x, y))
         
         self.spawn_timer = NPC_SPAWN_INTERVAL
-        self.grid_scale = 5
+        self.grid_scale = NAV_GRID_SCALE
         self.sub_tile_size = TILE_SIZE // self.grid_scale
         self.chairs = None
         self.grid = None
+        self.nav_cells = None
+        self.flow_fields = {}
+        self.grid_version = 0
+        self.path_cache = PathCache(PATH_CACHE_SIZE)
+        self.hierarchy = None
 
     def _initialize(self):
         if self.chairs is not None:
@@ -122,25 +194,40 @@ class TavernRoom(Room):
         ]
         
         self.grid = self.create_grid()
+        self.grid_version += 1
+        self.nav_cells = flatten_grid(self.grid, len(self.grid[0]))
+        self.flow_fields = {}
+        if NAVIGATION_MODE == 'flow_field':
+            for goal in self.navigation_goals():
+                self.flow_fields[goal] = FlowField(*self.nav_cells, goal, self.path_cache)
+        elif NAVIGATION_MODE == 'hpa':
+            # Kept across clear_objects, so only the clusters whose cells
+            # changed are rebuilt.
+            if self.hierarchy is None:
+                self.hierarchy = ClusterGraph(self.grid, HPA_CLUSTER_SIZE)
+            else:
+                self.hierarchy = self.hierarchy.updated(self.grid)
+
+    def clear_objects(self):
+        super().clear_objects()
+        # The grid and everything derived from it are rebuilt with the new
+        # objects on the next _initialize.
+        self.chairs = None
+        self.grid = None
+        self.nav_cells = None
+        self.flow_fields = {}
+        self.grid_version += 1
 
     def create_grid(self):
-        grid_width = self.scene.tmx_data.width * self.grid_scale
-        grid_height = self.scene.tmx_data.height * self.grid_scale
-        grid = [[0 for _ in range(grid_width)] for _ in range(grid_height)]
-        blocks = self.get_blocking_sprites()
-        
-        for sprite in blocks:
-            box = sprite.hitbox
-            start_x = box.left // self.sub_tile_size
-            end_x = box.right // self.sub_tile_size
-            start_y = box.top // self.sub_tile_size
-            end_y = box.bottom // self.sub_tile_size
-
-            for y in range(start_y, end_y):
-                for x in range(start_x, end_x):
-                    if 0 <= y < grid_height and 0 <= x < grid_width:
-                        grid[y][x] = 1
-        for sprite in self.chairs:
+        # Static tiles come pre-stamped from the compiled scene; only objects,
+        # guests and chairs are rasterised here.
+        grid_width = self.scene.compiled.width * self.grid_scale
+        grid_height = self.scene.compiled.height * self.grid_scale
+        grid = self.scene.compiled.nav_rows()
+        blocks = [obj for obj in self.objects if getattr(obj, 'is_blocking', False)] + \
+                 [npc for npc in self.npcs if getattr(npc, 'is_blocking', False)]
+
+        for sprite in blocks + self.chairs:
             box = sprite.hitbox
             start_x = box.left // self.sub_tile_size
             end_x = box.right // self.sub_tile_size
@@ -199,6 +286,35 @@ class TavernRoom(Room):
                             return (nx, ny)
         return None
 
+    def navigation_goals(self):
+        goals = {self.find_target(chair) for chair in self.chairs}
+        goals.update((int(x // self.sub_tile_size), int(y // self.sub_tile_size)) for x, y in self.spawn_points)
+        goals.discard(None)
+        return goals
+
+    def find_path(self, start, target):
+        return self.path_cache.find(start, target, self.grid_version, self.searcher(self.path_cache))
+
+    def searcher(self, stats=None, built=None):
+        # Bound to the grid as it is now, so a search running on a worker
+        # thread finishes on the grid it started with even if the room
+        # rebuilds it meanwhile. Off the main thread, flow fields it has to
+        # make go into `built` instead of the shared flow_fields, and the
+        # caller publishes them.
+        self._initialize()
+        grid, cells, fields = self.grid, self.nav_cells, self.flow_fields
+        if NAVIGATION_MODE == 'flow_field':
+            made = fields if built is None else built
+            def search(start, target):
+                if (field := fields.get(target)) is None:
+                    field = made[target] = FlowField(*cells, target, stats)
+                return field.path(start)
+            return search
+        if NAVIGATION_MODE == 'hpa':
+            hierarchy = self.hierarchy
+            return lambda start, target: hierarchy.find_path(start, target, stats)
+        return lambda start, target: astar(grid, start, target, stats)
+
     def spawn_npc(self):
         if not self.spawn_points:
             return
@@ -206,12 +322,12 @@ class TavernRoom(Room):
         spawn_pos = random.choice(self.spawn_points)
         
         new_npc = self.scene.factory.create_guest(pos=spawn_pos)
-        self.npcs.append(new_npc)
+        self.add_npc(new_npc)
 
-    def update(self, dt):
-        super().update(dt)
+    def update(self, dt, catch_up=False):
+        super().update(dt, catch_up)
         
-        self.npcs = [c for c in self.npcs if c.alive()]
+        self.prune_npcs()
 
         if 8 <= game_time.hours < 22:
             self.spawn_timer -= dt
@@ -233,8 +349,8 @@ class KitchenRoom(Room):
     def __init__(self, json_path, scene):
         super().__init__(json_path, scene)
     
-    def update(self, dt):
-        super().update(dt)
+    def update(self, dt, catch_up=False):
+        super().update(dt, catch_up)
        
     
 
@@ -242,8 +358,8 @@ class ToiletRoom(Room):
     def __init__(self, json_path, scene):
         super().__init__(json_path, scene)
     
-    def update(self, dt):
-        super().update(dt)
+    def update(self, dt, catch_up=False):
+        super().update(dt, catch_up)
         
     
 
@@ -251,6 +367,6 @@ class RestRoom(Room):
     def __init__(self, json_path, scene):
         super().__init__(json_path, scene)
     
-    def update(self, dt):
-        super().update(dt)
+    def update(self, dt, catch_up=False):
+        super().update(dt, catch_up)
     
\ No newline at end of file
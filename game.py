@@ -1,11 +1,16 @@
 import pygame
 from entities.room import room_manager
-from config import WIN_WIDTH, WIN_HEIGHT, FONT, TILE_SIZE, INPUTS, PLAYER_STATE, reset_player_state
+from config import WIN_WIDTH, WIN_HEIGHT, FONT, TILE_SIZE, INPUTS, PLAYER_STATE, DIRTY_RECTS, reset_player_state
 from core.game_time import game_time
+from core.timers import timers
+from core.path_service import path_service
 from core.state import MainMenu,  load_pygame
 import sys
 from ui.drag_manager import drag_manager
 from ui.ui_manager import ui_manager
+from utils.font_cache import font_cache
+from utils.asset_loader import asset_loader
+from utils.asset_bundle import asset_bundle
 import os
 import shutil
 import json
@@ -16,7 +21,7 @@ class Game:
         pygame.init()
         self.screen = pygame.display.set_mode((WIN_WIDTH,WIN_HEIGHT),pygame.FULLSCREEN|pygame.SCALED)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(FONT,TILE_SIZE)
+        self.font = font_cache.get_font(FONT,TILE_SIZE)
         self.running = True
         self.fps = 60
         self.states = []
@@ -49,6 +54,8 @@ class Game:
                     shutil.copy(os.path.join(default_path, filename), os.path.join(target_path, filename))
         
         room_manager.rooms.clear()
+        timers.clear()
+        path_service.clear()
         from core.state import Scene
         Scene(self, 'tavern', 'enter').enter_state()
 
@@ -84,13 +91,16 @@ class Game:
 
     def load_tmx(self, scene_name: str):
         if scene_name not in self.tmx_cache:
-            self.tmx_cache[scene_name] = load_pygame(f'scenes/maps/{scene_name}.tmx')
+            tmx_data = asset_bundle.load_map(scene_name) if asset_bundle else None
+            if tmx_data is None:
+                tmx_data = load_pygame(f'scenes/maps/{scene_name}.tmx')
+            self.tmx_cache[scene_name] = asset_loader.pack_tmx(tmx_data)
         return self.tmx_cache[scene_name]
     
     def render_text(self,text,colour,font,pos,centralised=True):
-        surf = font.render(str(text),False,colour)
+        surf = font_cache.render(font,text,colour,False)
         rect = surf.get_rect(center = pos) if centralised else surf.get_rect(topleft = pos)
-        self.screen.blit(surf,rect)
+        return self.screen.blit(surf,rect)
 
     def get_inputs(self):
         for event in pygame.event.get():
@@ -125,6 +135,8 @@ class Game:
                     INPUTS['down'] = True
                 elif event.key == pygame.K_e:
                     INPUTS['interact'] = True
+                elif event.key == pygame.K_t:
+                    INPUTS['wait'] = True
                
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_SPACE:
@@ -165,7 +177,11 @@ class Game:
             current_state.draw(self.screen)
             ui_manager.draw()
             
-            pygame.display.flip()
+            rects = current_state.get_dirty_rects(ui_manager.drawn_rects) if DIRTY_RECTS else None
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
 
     def get_current_state(self):
         if not self.states:
@@ -17,6 +17,8 @@ class Inventory:
         self._pick_return_index = None
         self.inventory_type = inventory_type
         self.active_slot_index = 0
+        self.version = 0
+        self._loaded_state = None
 
         if self.inventory_type == 'player':
             self.load_from_state()
@@ -74,6 +76,7 @@ class Inventory:
                             break
             result = amount
 
+        self.version += 1
         self.save_to_state()
         return result
 
@@ -97,6 +100,7 @@ class Inventory:
                 slot.remove(removed_count)
                 to_remove -= removed_count
 
+        self.version += 1
         self.save_to_state()
         return to_remove == 0
 
@@ -177,14 +181,19 @@ class Inventory:
         for i, slot_data in enumerate(slots_data):
             if i < len(self.slots):
                 self.slots[i] = InventorySlot.from_dict(slot_data)
+        self.version += 1
 
     def save_to_state(self):
         if self.inventory_type == 'player':
-            PLAYER_STATE['inventory'] = self.to_dict()
+            PLAYER_STATE['inventory'] = self._loaded_state = self.to_dict()
 
     def load_from_state(self):
         if self.inventory_type == 'player' and 'inventory' in PLAYER_STATE:
-            self.from_dict(PLAYER_STATE['inventory'])
+            state = PLAYER_STATE['inventory']
+            if state is self._loaded_state:
+                return
+            self._loaded_state = state
+            self.from_dict(state)
 
     def is_hover(self, mouse_pos):
         if self.inventory_type == 'storage' and not self.visible:
@@ -208,6 +217,7 @@ class Inventory:
             picked_slot = InventorySlot(source_slot.item_id, source_slot.amount)
             source_slot.clear()
 
+        self.version += 1
         return picked_slot
 
     def drop_item(self, drag_slot, mouse_pos, right_click):
@@ -225,6 +235,7 @@ class Inventory:
             target_slot.item_id, target_slot.amount = drag_slot.item_id, drag_slot.amount
             drag_slot.item_id, drag_slot.amount = temp_id, temp_amount
 
+        self.version += 1
         self.save_to_state()
         return True
 
@@ -240,6 +251,7 @@ class Inventory:
                 source_slot.item_id = final_drag_slot.item_id
                 source_slot.amount = final_drag_slot.amount
 
+        self.version += 1
         self.save_to_state()
         self._pick_return_index = None
 
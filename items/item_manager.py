@@ -2,6 +2,7 @@ import json
 import pygame
 import os
 from utils.asset_loader import asset_loader
+from utils.asset_bundle import asset_bundle
 
 class ItemManager:
     
@@ -13,6 +14,9 @@ class ItemManager:
      
 
     def _load_items(self):
+        if asset_bundle and (items := asset_bundle.get_data('items')) is not None:
+            self._items = items
+            return
         with open('assets/items/items_data.json', 'r', encoding='utf-8') as f:
             self._items = json.load(f)
 
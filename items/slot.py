@@ -1,6 +1,8 @@
 from items.item_manager import item_manager
 
 class InventorySlot:
+    __slots__ = ('item_id', 'amount', 'max_stack', 'is_ghost')
+
     def __init__(self, item_id=None, amount=0, max_stack=24):
         self.item_id = item_id
         self.amount = amount
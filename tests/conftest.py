@@ -0,0 +1,25 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def game():
+    from game import Game
+    return Game()
+
+
+@pytest.fixture
+def scene(game):
+    from core.state import Scene
+    scene = Scene(game, 'tavern', 'enter')
+    scene.enter_state()
+    return scene
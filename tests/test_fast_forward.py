@@ -0,0 +1,25 @@
+from core.entity_component_system import FindingChair
+from core.fast_forward import FastForward
+from core.path_service import path_service
+
+
+def test_guests_walk_within_one_step(scene, monkeypatch):
+    # Paths asked for during a wait are searched on the spot, so a guest
+    # starts walking on its first update however slow the machine is.
+    steps = {}
+    update = FindingChair.update
+
+    def counted(self, dt):
+        steps[self] = steps.get(self, 0) + 1
+        return update(self, dt)
+
+    monkeypatch.setattr(FindingChair, 'update', counted)
+    FastForward(scene.game, 240, stop_on_order=False, progress=False).run()
+    assert steps
+    assert max(steps.values()) == 1
+
+
+def test_workers_restored(scene):
+    workers = path_service.workers
+    FastForward(scene.game, 1, stop_on_order=False, progress=False).run()
+    assert path_service.workers == workers
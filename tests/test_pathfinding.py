@@ -0,0 +1,222 @@
+import heapq
+import pytest
+from utils.pathfinding import astar, flatten_grid, STRAIGHT, DIAGONAL
+from utils.flow_field import FlowField
+from utils.path_cache import PathCache, MISS
+from utils.hpa import ClusterGraph
+from core.path_service import PathService
+
+# The 2x2 room at (4, 4) is walled in on every side.
+LAYOUT = (
+    '............',
+    '.####..####.',
+    '.#......#...',
+    '.#.####.#.#.',
+    '...#..#...#.',
+    '.#.#..####..',
+    '.#.####.....',
+    '.#.######.#.',
+    '.#........#.',
+    '.##########.',
+)
+GRID = [[int(cell == '#') for cell in row] for row in LAYOUT]
+FREE = [(x, y) for y, row in enumerate(GRID) for x, cell in enumerate(row) if not cell]
+POCKET = (4, 4)
+QUERIES = [(start, goal) for start in FREE[::7] for goal in FREE[::5]]
+
+
+def cost(path):
+    return sum(DIAGONAL if a[0] != b[0] and a[1] != b[1] else STRAIGHT for a, b in zip(path, path[1:]))
+
+
+def shortest(grid, start, goal):
+    # Plain Dijkstra over (x, y) cells with the same moves as astar.
+    best = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        base, (x, y) = heapq.heappop(heap)
+        if (x, y) == goal:
+            return base
+        if base > best[(x, y)]:
+            continue
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < len(grid[0]) and 0 <= ny < len(grid)) or grid[ny][nx] or (dx, dy) == (0, 0):
+                    continue
+                if dx and dy and (grid[y][nx] or grid[ny][x]):
+                    continue
+                total = base + (DIAGONAL if dx and dy else STRAIGHT)
+                if total < best.get((nx, ny), float('inf')):
+                    best[(nx, ny)] = total
+                    heapq.heappush(heap, (total, (nx, ny)))
+    return None
+
+
+def assert_walkable(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        assert max(abs(ax - bx), abs(ay - by)) == 1
+        assert not grid[by][bx]
+        if ax != bx and ay != by:
+            assert not grid[ay][bx] and not grid[by][ax]
+
+
+def test_astar_finds_shortest_paths():
+    for start, goal in QUERIES:
+        path, expected = astar(GRID, start, goal), shortest(GRID, start, goal)
+        assert (path is None) == (expected is None)
+        if path:
+            assert_walkable(GRID, path, start, goal)
+            assert cost(path) == pytest.approx(expected)
+
+
+def test_astar_does_not_cut_corners():
+    assert astar([[0, 1], [1, 0]], (0, 0), (1, 1)) is None
+    assert astar([[0, 0], [1, 0]], (0, 0), (1, 1)) == [(0, 0), (1, 0), (1, 1)]
+
+
+def test_astar_unreachable_goal():
+    assert astar(GRID, (0, 0), POCKET) is None
+    assert astar(GRID, (0, 0), (1, 1)) is None
+    assert astar(GRID, (0, 0), (20, 0)) is None
+
+
+def test_flow_field_matches_astar():
+    blocked, stride = flatten_grid(GRID, len(GRID[0]))
+    for goal in FREE[::5]:
+        field = FlowField(blocked, stride, goal)
+        for start in FREE[::7]:
+            expected, path = astar(GRID, start, goal), field.path(start)
+            assert (path is None) == (expected is None)
+            if path:
+                assert_walkable(GRID, path, start, goal)
+                assert cost(path) == pytest.approx(cost(expected))
+
+
+def test_flow_field_unreachable_goal():
+    blocked, stride = flatten_grid(GRID, len(GRID[0]))
+    assert FlowField(blocked, stride, POCKET).path((0, 0)) is None
+    assert FlowField(*flatten_grid([[0, 1], [1, 0]], 2), (1, 1)).path((0, 0)) is None
+
+
+def test_path_cache_slices_stored_paths():
+    cache = PathCache(8)
+    path = astar(GRID, (0, 0), (11, 9))
+    cache.store((0, 0), (11, 9), 1, path)
+    a, b = path[2], path[-3]
+    assert cache.lookup(a, b, 1) == path[2:-2]
+    assert cache.lookup(b, a, 1) == path[2:-2][::-1]
+    assert cache.sliced == 2
+
+
+def test_path_cache_keeps_unreachable_goals():
+    cache = PathCache(8)
+    assert cache.find((0, 0), POCKET, 1, lambda start, goal: astar(GRID, start, goal)) is None
+    assert cache.lookup((0, 0), POCKET, 1) is None
+
+
+def test_path_cache_misses_after_grid_version_changes():
+    cache = PathCache(8)
+    path = astar(GRID, (0, 0), (11, 9))
+    cache.store((0, 0), (11, 9), 1, path)
+    assert cache.lookup((0, 0), (11, 9), 2) is MISS
+    assert cache.lookup(path[2], path[-3], 2) is MISS
+
+
+def test_path_cache_evicts_oldest():
+    cache = PathCache(2)
+    for goal in FREE[1:4]:
+        cache.store((0, 0), goal, 1, astar(GRID, (0, 0), goal))
+    assert list(cache.paths) == [((0, 0), goal, 1) for goal in FREE[2:4]]
+    assert all(keys <= cache.paths.keys() for keys in cache.through.values())
+
+
+class GridRoom:
+    # The parts of TavernRoom the path service uses.
+    def __init__(self, grid):
+        self.grid = grid
+        self.grid_version = 1
+        self.path_cache = PathCache(16)
+        self.flow_fields = {}
+
+    def searcher(self, stats=None, built=None):
+        grid = [list(row) for row in self.grid]
+        return lambda start, goal: astar(grid, start, goal, stats)
+
+
+def test_path_service_hands_back_cache_hits_at_once():
+    room = GridRoom(GRID)
+    room.path_cache.store((0, 0), (11, 9), room.grid_version, astar(GRID, (0, 0), (11, 9)))
+    request = PathService(workers=1).request(room, (0, 0), (11, 9))
+    assert request.done and request.path == astar(GRID, (0, 0), (11, 9))
+
+
+def test_path_service_searches_inline_without_workers():
+    room = GridRoom(GRID)
+    service = PathService(workers=0)
+    request = service.request(room, (0, 0), (11, 9))
+    assert request.done and not service.pending
+    assert request.path == astar(GRID, (0, 0), (11, 9))
+
+
+def test_path_service_resubmits_after_grid_change():
+    room = GridRoom([list(row) for row in GRID])
+    service = PathService(workers=1, per_frame=1)
+    request = service.request(room, (0, 0), (11, 0))
+    request.future.result()
+
+    # The straight run along the top row is walled off before the result
+    # is handed back, so it has to be searched again.
+    room.grid[0][6] = 1
+    room.grid_version += 1
+    service.update()
+    assert not request.done
+    request.future.result()
+    service.update()
+    assert request.done
+    assert request.path == astar(room.grid, (0, 0), (11, 0))
+    assert (6, 0) not in request.path
+    service.executor.shutdown()
+
+
+def test_path_service_drops_cancelled_requests():
+    room = GridRoom(GRID)
+    service = PathService(workers=1)
+    request = service.request(room, (0, 0), (11, 9))
+    service.cancel(request)
+    service.finish()
+    service.update()
+    assert not request.done and not service.pending
+    service.executor.shutdown()
+
+
+def test_hpa_paths_are_near_shortest():
+    graph = ClusterGraph(GRID, 4)
+    for start, goal in QUERIES:
+        expected, path = astar(GRID, start, goal), graph.find_path(start, goal)
+        assert (path is None) == (expected is None)
+        if path:
+            assert_walkable(GRID, path, start, goal)
+            assert cost(expected) - 1e-9 <= cost(path) <= cost(expected) * 1.25
+
+
+def test_hpa_unreachable_goal():
+    graph = ClusterGraph(GRID, 4)
+    assert graph.find_path((0, 0), POCKET) is None
+    assert graph.find_path((0, 0), (1, 1)) is None
+
+
+def test_hpa_update_matches_full_build():
+    grid = [list(row) for row in GRID]
+    graph = ClusterGraph(grid, 4)
+    before = [graph.find_path(start, goal) for start, goal in QUERIES]
+    for y in range(6, 9):
+        grid[y][9] = 1
+    updated, rebuilt = graph.updated(grid), ClusterGraph(grid, 4)
+    assert updated.rebuilt < rebuilt.rebuilt
+    assert updated.entrances == rebuilt.entrances
+    for start, goal in QUERIES:
+        assert updated.find_path(start, goal) == rebuilt.find_path(start, goal)
+    # The old graph is left as it was for searches still running on it.
+    assert [graph.find_path(start, goal) for start, goal in QUERIES] == before
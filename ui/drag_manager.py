@@ -3,6 +3,7 @@ from typing import List
 from config import INPUTS
 from items.item_manager import item_manager
 from items.slot import InventorySlot
+from utils.font_cache import font_cache
 
 
 class DraggableUI:
@@ -98,8 +99,8 @@ class DragManager:
 
         amount = self.drag_slot.amount
         if amount > 1:
-            font = pygame.font.Font(None, 14)
-            text = font.render(str(amount), True, (255,255,255))
+            text = font_cache.render_number(font_cache.get_font(None, 14), amount, (255,255,255))
             surface.blit(text, (rect.right - text.get_width(), rect.bottom - text.get_height()))
+        return rect
 
 drag_manager = DragManager()
\ No newline at end of file
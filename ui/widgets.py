@@ -0,0 +1,211 @@
+import pygame
+from config import COLOURS
+from items.inventory import Inventory
+from items.item_manager import item_manager
+from items.slot import InventorySlot
+from utils.font_cache import font_cache
+
+
+def draw_slot(surface, slot, rect, font):
+    pygame.draw.rect(surface, COLOURS['light_gray'], rect)
+    pygame.draw.rect(surface, COLOURS['dark_gray'], rect, 1)
+    if not slot or slot.is_empty():
+        return
+
+    sprite = item_manager.get_sprite(slot.item_id, (Inventory.ITEM_SIZE,Inventory.ITEM_SIZE))
+    if not sprite:
+        return
+
+    sprite.set_alpha(100 if getattr(slot, 'is_ghost', False) else 255)
+    surface.blit(sprite, sprite.get_rect(center=rect.center))
+
+    if slot.amount > 1:
+        text_surf = font_cache.render_number(font, slot.amount, COLOURS['white'])
+        surface.blit(text_surf, text_surf.get_rect(bottomright=(rect.right - 2, rect.bottom - 2)))
+
+
+def draw_slot_grid(surface, cells, font):
+    # Slots in a grid never overlap, so backgrounds, icons and counters can
+    # each go out in one pass instead of interleaving per slot.
+    icons = []
+    labels = []
+    for slot, rect in cells:
+        pygame.draw.rect(surface, COLOURS['light_gray'], rect)
+        pygame.draw.rect(surface, COLOURS['dark_gray'], rect, 1)
+        if not slot or slot.is_empty():
+            continue
+
+        sprite = item_manager.get_sprite(slot.item_id, (Inventory.ITEM_SIZE,Inventory.ITEM_SIZE))
+        if not sprite:
+            continue
+
+        item_rect = sprite.get_rect(center=rect.center)
+        if getattr(slot, 'is_ghost', False):
+            sprite.set_alpha(100)
+            surface.blit(sprite, item_rect)
+        else:
+            sprite.set_alpha(255)
+            icons.append((sprite, item_rect))
+
+        if slot.amount > 1:
+            text_surf = font_cache.render_number(font, slot.amount, COLOURS['white'])
+            labels.append((text_surf, text_surf.get_rect(bottomright=(rect.right - 2, rect.bottom - 2))))
+
+    surface.blits(icons, doreturn=False)
+    surface.blits(labels, doreturn=False)
+
+
+class Widget:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.key = None
+        self.dirty = True
+
+    def state_key(self):
+        return None
+
+    def render(self, surface):
+        pass
+
+    def draw(self, screen):
+        key = self.state_key()
+        if self.dirty or key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            self.render(self.surface)
+            self.key = key
+            self.dirty = False
+        return screen.blit(self.surface, self.rect)
+
+
+class InventoryPanel(Widget):
+    def __init__(self, inventory, rows, pos, font, background=False):
+        step = inventory.SLOT_SIZE + inventory.PADDING
+        if background:
+            rect = pygame.Rect(pos[0] - 8, pos[1] - 8, inventory.width * step + 12, len(rows) * step + 12)
+        else:
+            rect = pygame.Rect(pos, (inventory.width * step - inventory.PADDING, len(rows) * step - inventory.PADDING))
+        super().__init__(rect)
+        self.inventory = inventory
+        self.rows = rows
+        self.origin = (pos[0] - rect.x, pos[1] - rect.y)
+        self.font = font
+        self.background = background
+
+    def state_key(self):
+        return self.inventory.version
+
+    def render(self, surface):
+        inv = self.inventory
+        step = inv.SLOT_SIZE + inv.PADDING
+        if self.background:
+            bg_rect = surface.get_rect()
+            pygame.draw.rect(surface, COLOURS['gray'], bg_rect)
+            pygame.draw.rect(surface, COLOURS['dark_gray'], bg_rect, 2)
+
+        cells = []
+        for y, row in enumerate(self.rows):
+            for x in range(inv.width):
+                slot_index = row * inv.width + x
+                if slot_index >= len(inv.slots):
+                    continue
+                rect = pygame.Rect(self.origin[0] + x * step, self.origin[1] + y * step, inv.SLOT_SIZE, inv.SLOT_SIZE)
+                cells.append((inv.slots[slot_index], rect))
+        draw_slot_grid(surface, cells, self.font)
+
+
+class StovePanel(Widget):
+    def __init__(self, interface):
+        super().__init__(interface.window_rect)
+        self.interface = interface
+
+    def progress_width(self):
+        stove = self.interface.stove
+        if not stove.is_cooking or stove.cooking_time <= 0:
+            return None
+        ratio = 1.0 - stove.cooking_timer / stove.cooking_time
+        return int(self.interface.progress_bar_rect.width * ratio)
+
+    def state_key(self):
+        stove = self.interface.stove
+        return stove.version, stove.fluid_amount, stove.fluid_max_amount, self.progress_width()
+
+    def local(self, rect):
+        return pygame.Rect(rect).move(-self.rect.x, -self.rect.y)
+
+    def render(self, surface):
+        interface = self.interface
+        stove = interface.stove
+        size = interface.slot_size
+        surface.fill(COLOURS['gray'])
+
+        for i, pos in enumerate(interface.slot_positions):
+            draw_slot(surface, interface.ingredient_slots[i], self.local((pos, (size, size))), interface.font)
+
+        draw_slot(surface, interface.result_item, self.local((interface.result_slot_pos, (size, size))), interface.font)
+
+        fuel_rect = self.local((interface.fuel_slot_pos, (size, size)))
+        draw_slot(surface, stove.ingredient_slots[0], fuel_rect, interface.font)
+
+        fuel_text = font_cache.render(interface.font, f"Fuel: {stove.fluid_amount}/{stove.fluid_max_amount}", COLOURS['white'])
+        surface.blit(fuel_text, (fuel_rect.x, fuel_rect.y + size + 5))
+
+        if (width := self.progress_width()) is not None:
+            bar_rect = self.local(interface.progress_bar_rect)
+            pygame.draw.rect(surface, COLOURS['gray'], bar_rect)
+            bar_rect.width = width
+            pygame.draw.rect(surface, COLOURS['green'], bar_rect)
+
+        button_rect = self.local(interface.recipe_button_rect)
+        if interface.recipe_button_image:
+            surface.blit(interface.recipe_button_image, button_rect)
+        else:
+            pygame.draw.rect(surface, COLOURS['dark_gray'], button_rect)
+
+
+class RecipePanel(Widget):
+    CELL_HEIGHT = 30
+    ICON_SIZE = 24
+    MARGIN = 5
+    SPACING = 4
+
+    def __init__(self, interface):
+        super().__init__(interface.recipe_window_rect)
+        self.interface = interface
+
+    def state_key(self):
+        return self.interface.recipe_page
+
+    def render(self, surface):
+        interface = self.interface
+        surface.fill(COLOURS['light_gray'])
+
+        recipes = list(interface.recipes.values()) if isinstance(interface.recipes, dict) else interface.recipes
+        page = interface.recipe_page * interface.recipes_per_page
+        icon_size, spacing = self.ICON_SIZE, self.SPACING
+
+        for i, recipe in enumerate(recipes[page:page + interface.recipes_per_page]):
+            y = self.MARGIN + i * self.CELL_HEIGHT
+            icon_y = y + (self.CELL_HEIGHT - icon_size) // 2
+
+            res_rect = pygame.Rect(self.MARGIN, icon_y, icon_size, icon_size)
+            draw_slot(surface, InventorySlot(recipe['result'], recipe.get('amount', 1)), res_rect, interface.font)
+
+            eq_text = font_cache.render(interface.font, '=', COLOURS['black'])
+            eq_x = res_rect.right + spacing
+            surface.blit(eq_text, (eq_x, y + (self.CELL_HEIGHT - eq_text.get_height()) // 2))
+
+            ing_start_x = eq_x + eq_text.get_width() + spacing
+            for j, (ing_id, amount) in enumerate(recipe['ingredients'].items()):
+                ing_rect = pygame.Rect(ing_start_x + j * (icon_size + spacing), icon_y, icon_size, icon_size)
+                draw_slot(surface, InventorySlot(ing_id, amount), ing_rect, interface.font)
+
+
+def render_bubble(image):
+    bg_rect = image.get_rect().inflate(10, 10)
+    surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
+    bg_rect.topleft = (0, 0)
+    pygame.draw.rect(surface, (255, 255, 255), bg_rect, border_radius=5)
+    pygame.draw.rect(surface, (0, 0, 0), bg_rect, width=2, border_radius=5)
+    surface.blit(image, (5, 5))
+    return surface
@@ -0,0 +1,287 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import xml.etree.ElementTree as ET
+import pygame
+from config import ASSET_BUNDLE, CHARACTER_SPRITE_SIZE
+
+MAGIC = b'TAVB'
+BUNDLE_VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+
+ITEM_ICON_SIZE = (32, 32)
+DATA_FILES = {'items': 'assets/items/items_data.json', 'recipes': 'assets/items/recipes.json'}
+MAPS_DIR = 'scenes/maps'
+CHARACTERS_DIR = 'assets/characters'
+OBJECTS_DIR = 'scenes/objects'
+EXTRA_IMAGES = [('assets/ui/recipe_book.png', None)]
+
+
+def map_sources(tmx_path):
+    sources = [tmx_path]
+    base = os.path.dirname(tmx_path)
+    for tileset in ET.parse(tmx_path).getroot().iter('tileset'):
+        if source := tileset.get('source'):
+            tsx_path = os.path.normpath(os.path.join(base, source))
+            sources.append(tsx_path)
+            images = ET.parse(tsx_path).getroot().iter('image')
+            image_base = os.path.dirname(tsx_path)
+        else:
+            images = tileset.iter('image')
+            image_base = base
+        for image in images:
+            sources.append(os.path.normpath(os.path.join(image_base, image.get('source'))))
+    return sources
+
+
+def _mtime(path):
+    return os.stat(path).st_mtime_ns
+
+
+class BundleObject:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class BundleObjectGroup(list):
+    def __init__(self, name, objects):
+        super().__init__(BundleObject(**obj) for obj in objects)
+        self.name = name
+
+
+class BundleTileLayer:
+    def __init__(self, parent, name, data):
+        self.parent = parent
+        self.name = name
+        self.data = data
+
+    def tiles(self):
+        images = self.parent.images
+        for y, row in enumerate(self.data):
+            for x, gid in enumerate(row):
+                if gid and (image := images[gid]):
+                    yield x, y, image
+
+    def iter_data(self):
+        for y, row in enumerate(self.data):
+            for x, gid in enumerate(row):
+                yield x, y, gid
+
+
+class BundleMap:
+    def __init__(self, bundle, data):
+        self.width = data['width']
+        self.height = data['height']
+        self.tilewidth = data['tilewidth']
+        self.tileheight = data['tileheight']
+        self.images = [bundle.surface(entry) if entry else None for entry in data['images']]
+        self.layers = []
+        for layer in data['layers']:
+            if layer['type'] == 'tiles':
+                self.layers.append(BundleTileLayer(self, layer['name'], layer['data']))
+            else:
+                self.layers.append(BundleObjectGroup(layer['name'], layer['objects']))
+        self.layernames = {layer.name: layer for layer in self.layers}
+
+    def get_layer_by_name(self, name):
+        try:
+            return self.layernames[name]
+        except KeyError:
+            raise ValueError(f'Layer "{name}" not found.')
+
+
+class AssetBundle:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f'{path} is not a version {BUNDLE_VERSION} asset bundle')
+        self.index = pickle.loads(self.data[HEADER.size:HEADER.size + index_size])
+        self.base = HEADER.size + index_size
+
+    def is_stale(self):
+        for path, mtime in self.index['sources'].items():
+            try:
+                if _mtime(path) != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def surface(self, entry):
+        offset, length, size, fmt, colorkey = entry
+        start = self.base + offset
+        image = pygame.image.frombuffer(memoryview(self.data)[start:start + length], size, fmt)
+        image = image.convert_alpha() if fmt == 'RGBA' else image.convert()
+        if colorkey is not None:
+            image.set_colorkey(colorkey, pygame.RLEACCEL)
+        return image
+
+    def image(self, path, size=None):
+        entry = self.index['images'].get((path, size))
+        return self.surface(entry) if entry else None
+
+    def animation_frames(self, base_path, size=None):
+        return self.index['animations'].get((base_path, size))
+
+    def get_data(self, name):
+        return self.index['data'].get(name)
+
+    def load_map(self, name):
+        data = self.index['maps'].get(name)
+        return BundleMap(self, data) if data else None
+
+
+def open_bundle(path=ASSET_BUNDLE):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (ValueError, struct.error, pickle.UnpicklingError) as e:
+        print(f"Ignoring asset bundle: {e}")
+        return None
+    if bundle.is_stale():
+        print(f"Asset bundle {path} is stale, loading loose files. Rebuild with: python -m utils.asset_bundle")
+        return None
+    return bundle
+
+
+class BundleWriter:
+    def __init__(self):
+        self.blobs = []
+        self.offset = 0
+        self.sources = {}
+
+    def track(self, *paths):
+        for path in paths:
+            self.sources[path] = _mtime(path)
+
+    def add_surface(self, image):
+        if image.get_flags() & pygame.SRCALPHA:
+            fmt, colorkey = 'RGBA', None
+        else:
+            fmt, colorkey = 'RGB', image.get_colorkey()
+            colorkey = tuple(colorkey[:3]) if colorkey else None
+        pixels = pygame.image.tobytes(image, fmt)
+        entry = (self.offset, len(pixels), image.get_size(), fmt, colorkey)
+        self.blobs.append(pixels)
+        self.offset += len(pixels)
+        return entry
+
+    def write(self, path, index):
+        index['sources'] = self.sources
+        payload = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, BUNDLE_VERSION, len(payload)))
+            f.write(payload)
+            for blob in self.blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+
+
+def _object_frames():
+    frames = set()
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == 'animations' and isinstance(value, dict):
+                    frames.update(frame for anim in value.values() for frame in anim)
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    for root, _, files in os.walk(OBJECTS_DIR):
+        for filename in files:
+            if filename.endswith('.json'):
+                with open(os.path.join(root, filename), encoding='utf-8') as f:
+                    walk(json.load(f))
+    return sorted(frames)
+
+
+def build(path=ASSET_BUNDLE):
+    from pytmx.util_pygame import load_pygame
+    from utils.asset_loader import AssetLoader
+
+    loader = AssetLoader(pack=False, bundle=None)
+    writer = BundleWriter()
+    index = {'images': {}, 'animations': {}, 'data': {}, 'maps': {}}
+
+    def add_image(key_path, size):
+        image = loader.get_image(key_path, size)
+        writer.track(loader.resolve(key_path))
+        index['images'][(key_path, size)] = writer.add_surface(image)
+
+    for name, data_path in DATA_FILES.items():
+        with open(data_path, encoding='utf-8') as f:
+            index['data'][name] = json.load(f)
+        writer.track(data_path)
+
+    items_dir = os.path.dirname(DATA_FILES['items'])
+    writer.track(items_dir)
+    for category in index['data']['items'].values():
+        if isinstance(category, dict):
+            for item_info in category.get('items', {}).values():
+                sprite = item_info if isinstance(item_info, str) else item_info.get('sprite')
+                if sprite:
+                    add_image(loader.item_path(sprite), ITEM_ICON_SIZE)
+
+    writer.track(CHARACTERS_DIR)
+    for name in sorted(os.listdir(CHARACTERS_DIR)):
+        base_path = os.path.join(CHARACTERS_DIR, name)
+        if not os.path.isdir(base_path):
+            continue
+        frame_paths = loader.list_animation_frames(base_path)
+        writer.track(base_path, *(os.path.join(base_path, anim) for anim in frame_paths))
+        for paths in frame_paths.values():
+            for frame_path in paths:
+                add_image(frame_path, CHARACTER_SPRITE_SIZE)
+        index['animations'][(base_path, CHARACTER_SPRITE_SIZE)] = frame_paths
+
+    for frame in _object_frames():
+        add_image(frame, None)
+    for image_path, size in EXTRA_IMAGES:
+        add_image(image_path, size)
+
+    writer.track(MAPS_DIR)
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith('.tmx'):
+            continue
+        tmx_path = os.path.join(MAPS_DIR, filename)
+        tmx_data = load_pygame(tmx_path)
+        writer.track(*map_sources(tmx_path))
+        layers = []
+        for layer in tmx_data.layers:
+            if hasattr(layer, 'tiles'):
+                layers.append({'type': 'tiles', 'name': layer.name, 'data': [list(row) for row in layer.data]})
+            else:
+                objects = [{'name': obj.name, 'type': obj.type, 'x': obj.x, 'y': obj.y,
+                            'width': obj.width, 'height': obj.height, 'properties': dict(obj.properties)}
+                           for obj in layer]
+                layers.append({'type': 'objects', 'name': layer.name, 'objects': objects})
+        index['maps'][os.path.splitext(filename)[0]] = {
+            'width': tmx_data.width, 'height': tmx_data.height,
+            'tilewidth': tmx_data.tilewidth, 'tileheight': tmx_data.tileheight,
+            'images': [writer.add_surface(image) if image else None for image in tmx_data.images],
+            'layers': layers,
+        }
+
+    writer.write(path, index)
+    return len(writer.sources), writer.offset
+
+
+asset_bundle = open_bundle()
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    sources, size = build()
+    print(f"Wrote {ASSET_BUNDLE}: {sources} source files, {size / 1024:.1f} KiB of pixel data")
@@ -1,42 +1,67 @@
 import pygame
 import os
+from config import PACK_TEXTURES
+from utils.atlas import TextureAtlas
+from utils.asset_bundle import asset_bundle
 
 
 class AssetLoader:
-    def __init__(self):
+    def __init__(self, pack=PACK_TEXTURES, bundle=asset_bundle):
         self._image_cache = {}
         self._animation_cache = {}
+        self.atlas = TextureAtlas() if pack else None
+        self.bundle = bundle
+
+    def resolve(self, path):
+        if os.path.exists(path):
+            return path
+        return os.path.join('assets', 'objects', path) + '.png'
+
+    def item_path(self, filename):
+        if not filename.endswith('.png'):
+            filename += '.png'
+        return os.path.join('assets', 'items', filename)
+
+    def _load(self, path, size):
+        if self.bundle and (image := self.bundle.image(path, size)) is not None:
+            return image
+
+        image = pygame.image.load(self.resolve(path)).convert_alpha()
+        if size:
+            image = pygame.transform.scale(image, size)
+        return image
 
     def get_image(self, path, size = None):
         cache_key = (path, size)
         if cache_key not in self._image_cache:
-                full_path = path
-                if not os.path.exists(full_path):
-                    full_path = os.path.join('assets', 'objects', path) + '.png'
-                
-                image = pygame.image.load(full_path).convert_alpha()
-                if size:
-                    image = pygame.transform.scale(image, size)
-                self._image_cache[cache_key] = image
+                image = self._load(path, size)
+                self._image_cache[cache_key] = self.atlas.add(image) if self.atlas else image
         return self._image_cache[cache_key]
 
-    def get_item_image(self, filename, size=None):
-        if not filename.endswith('.png'):
-            filename += '.png'
-        path = os.path.join('assets', 'items', filename)
-        return self.get_image(path, size)
+    def get_images(self, paths, size = None):
+        missing = [path for path in paths if (path, size) not in self._image_cache]
+        images = [self._load(path, size) for path in missing]
+        if self.atlas:
+            images = self.atlas.add_many(images)
+        for path, image in zip(missing, images):
+            self._image_cache[(path, size)] = image
+        return [self._image_cache[(path, size)] for path in paths]
 
-    def get_animations(self, base_path, size = None):
-        cache_key = (base_path, size)
-        if cache_key in self._animation_cache:
-            return self._animation_cache[cache_key]
+    def pack_tmx(self, tmx_data):
+        if self.atlas:
+            tmx_data.images = self.atlas.add_many(tmx_data.images)
+        return tmx_data
+
+    def get_item_image(self, filename, size=None):
+        return self.get_image(self.item_path(filename), size)
 
-        animations = {}
+    def list_animation_frames(self, base_path):
+        frame_paths = {}
         
         for anim_name in os.listdir(base_path):
             anim_path = os.path.join(base_path, anim_name)
             if os.path.isdir(anim_path):
-                images = []
+                paths = []
                 try:
                     sorted_files = sorted(os.listdir(anim_path), key=lambda x: int(os.path.splitext(x)[0]))
                 except (ValueError, IndexError):
@@ -44,9 +69,22 @@ class AssetLoader:
 
                 for frame_file in sorted_files:
                     if frame_file.endswith('.png'):
-                        frame_path = os.path.join(anim_path, frame_file)
-                        images.append(self.get_image(frame_path, size=size))
-                animations[anim_name] = images
+                        paths.append(os.path.join(anim_path, frame_file))
+                frame_paths[anim_name] = paths
+        return frame_paths
+
+    def get_animations(self, base_path, size = None):
+        cache_key = (base_path, size)
+        if cache_key in self._animation_cache:
+            return self._animation_cache[cache_key]
+
+        frame_paths = self.bundle and self.bundle.animation_frames(base_path, size)
+        if not frame_paths:
+            frame_paths = self.list_animation_frames(base_path)
+
+        # All frames of a character are packed as one batch so they share a page.
+        images = iter(self.get_images([path for paths in frame_paths.values() for path in paths], size=size))
+        animations = {anim_name: [next(images) for _ in paths] for anim_name, paths in frame_paths.items()}
 
         self._animation_cache[cache_key] = animations
         return animations
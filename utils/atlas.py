@@ -0,0 +1,123 @@
+import pygame
+from config import ATLAS_PAGE_SIZE
+
+
+class ShelfPacker:
+    def __init__(self, width, height, padding):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.shelves = []
+
+    @property
+    def used_height(self):
+        return self.shelves[-1][0] + self.shelves[-1][1] if self.shelves else 0
+
+    @property
+    def used_width(self):
+        return max((shelf[2] for shelf in self.shelves), default=0)
+
+    def insert(self, width, height):
+        width += self.padding
+        height += self.padding
+        fits = [shelf for shelf in self.shelves if height <= shelf[1] and shelf[2] + width <= self.width]
+        if fits:
+            shelf = min(fits, key=lambda shelf: shelf[1])
+            x = shelf[2]
+            shelf[2] += width
+            return x, shelf[0]
+
+        top = self.used_height
+        if top + height > self.height or width > self.width:
+            return None
+        self.shelves.append([top, height, width])
+        return 0, top
+
+
+class AtlasPage:
+    def __init__(self, width, height, padding, alpha):
+        if alpha:
+            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        else:
+            self.surface = pygame.Surface((width, height)).convert()
+        self.alpha = alpha
+        self.packer = ShelfPacker(width, height, padding)
+        self.used_area = 0
+
+    def place(self, image, pos):
+        # Alpha pages start fully transparent, so a max blend copies the
+        # pixels (alpha included) without any blending.
+        self.surface.blit(image, pos, special_flags=pygame.BLEND_RGBA_MAX if self.alpha else 0)
+        self.used_area += image.get_width() * image.get_height()
+        return self.surface.subsurface((pos, image.get_size()))
+
+
+class TextureAtlas:
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=0):
+        self.page_size = page_size
+        self.spill_size = page_size // 4
+        self.padding = padding
+        self.pages = []
+        self.spill_pages = {True: [], False: []}
+        self.count = 0
+
+    def _fits(self, image, size):
+        return image.get_width() + self.padding <= size and image.get_height() + self.padding <= size
+
+    def _prepare(self, image):
+        # Opaque tiles stay opaque so they keep the fast copy blit; colorkeyed
+        # images go to alpha pages with the key turned into transparency.
+        if image.get_colorkey() is not None and not image.get_flags() & pygame.SRCALPHA:
+            image = image.convert_alpha()
+        return image, bool(image.get_flags() & pygame.SRCALPHA)
+
+    def add(self, image):
+        if not self._fits(image, self.spill_size):
+            return self.add_many([image])[0]
+
+        image, alpha = self._prepare(image)
+        pages = self.spill_pages[alpha]
+        for page in pages:
+            if (pos := page.packer.insert(*image.get_size())) is not None:
+                break
+        else:
+            page = AtlasPage(self.spill_size, self.spill_size, self.padding, alpha)
+            pages.append(page)
+            pos = page.packer.insert(*image.get_size())
+
+        self.count += 1
+        return page.place(image, pos)
+
+    def add_many(self, images):
+        # Lay the whole batch out first so every page can be allocated at
+        # exactly the size its shelves use.
+        result = list(images)
+        prepared = {i: self._prepare(image) for i, image in enumerate(result)
+                    if image and self._fits(image, self.page_size)}
+        for alpha in (False, True):
+            order = sorted((i for i in prepared if prepared[i][1] == alpha),
+                           key=lambda i: (-result[i].get_height(), -result[i].get_width()))
+            layouts = []
+            packer = None
+            for i in order:
+                size = result[i].get_size()
+                if packer is None or (pos := packer.insert(*size)) is None:
+                    packer = ShelfPacker(self.page_size, self.page_size, self.padding)
+                    layouts.append((packer, []))
+                    pos = packer.insert(*size)
+                layouts[-1][1].append((i, pos))
+
+            for packer, placements in layouts:
+                page = AtlasPage(packer.used_width, packer.used_height, self.padding, alpha)
+                self.pages.append(page)
+                for i, pos in placements:
+                    result[i] = page.place(prepared[i][0], pos)
+                    self.count += 1
+        return result
+
+    def report(self):
+        pages = self.pages + self.spill_pages[True] + self.spill_pages[False]
+        page_bytes = sum(page.surface.get_pitch() * page.surface.get_height() for page in pages)
+        used = sum(page.used_area for page in pages)
+        return {'images': self.count, 'pages': len(pages), 'bytes': page_bytes,
+                'utilisation': used * 4 / page_bytes if page_bytes else 0.0}
@@ -0,0 +1,23 @@
+from operator import attrgetter
+from utils.spatial_hash import SpatialHash
+
+
+class CollisionGrid(SpatialHash):
+    def __init__(self, cell_size):
+        super().__init__(cell_size, attrgetter('hitbox'))
+        self.order = {}
+
+    def add(self, sprite, key):
+        self.order[sprite] = key
+        self.insert(sprite)
+
+    def discard(self, sprite):
+        self.order.pop(sprite, None)
+        self.remove(sprite)
+
+    def blockers_near(self, rect, exclude=None):
+        # Sorted by the keys given to add(), so the first hit is the one a
+        # linear scan over the blockers in that order would find.
+        found = self.candidates(rect)
+        found.discard(exclude)
+        return sorted(found, key=self.order.__getitem__)
@@ -0,0 +1,81 @@
+import heapq
+from array import array
+from utils.pathfinding import STRAIGHT, DIAGONAL, INF
+
+
+class FlowField:
+    # Distance from every cell to one goal, filled by a Dijkstra search that
+    # starts at the goal. Moves are symmetric (corner cutting needs both
+    # orthogonal cells free either way round), so walking downhill from any
+    # cell follows a shortest path to the goal without searching again.
+    __slots__ = ('goal', 'blocked', 'stride', 'distance')
+
+    def __init__(self, blocked, stride, goal, stats=None):
+        self.goal = goal
+        self.blocked = blocked
+        self.stride = stride
+        self.distance = distance = array('d', [INF]) * len(blocked)
+
+        gx, gy = goal
+        goal_cell = (gy + 1) * stride + gx + 1
+        distance[goal_cell] = 0
+        straight = (-stride, stride, -1, 1)
+        diagonal = ((-1, -stride), (1, -stride), (-1, stride), (1, stride))
+        heap = [(0, goal_cell)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expanded = 0
+
+        while heap:
+            base, cell = heappop(heap)
+            if base > distance[cell]:
+                continue
+            expanded += 1
+            for offset in straight:
+                neighbour = cell + offset
+                cost = base + STRAIGHT
+                if not blocked[neighbour] and cost < distance[neighbour]:
+                    distance[neighbour] = cost
+                    heappush(heap, (cost, neighbour))
+            for step_x, step_y in diagonal:
+                neighbour = cell + step_x + step_y
+                cost = base + DIAGONAL
+                if not blocked[neighbour] and cost < distance[neighbour] \
+                        and not blocked[cell + step_x] and not blocked[cell + step_y]:
+                    distance[neighbour] = cost
+                    heappush(heap, (cost, neighbour))
+
+        if stats is not None:
+            stats.expanded += expanded
+
+    def next_cell(self, cell):
+        blocked, distance, stride = self.blocked, self.distance, self.stride
+        best, best_cost = None, INF
+        for offset in (-stride, stride, -1, 1):
+            neighbour = cell + offset
+            if not blocked[neighbour] and (cost := STRAIGHT + distance[neighbour]) < best_cost:
+                best, best_cost = neighbour, cost
+        for step_x, step_y in ((-1, -stride), (1, -stride), (-1, stride), (1, stride)):
+            neighbour = cell + step_x + step_y
+            if not blocked[neighbour] and not blocked[cell + step_x] and not blocked[cell + step_y] \
+                    and (cost := DIAGONAL + distance[neighbour]) < best_cost:
+                best, best_cost = neighbour, cost
+        return best
+
+    def path(self, start):
+        # Same contract as astar: a list of (x, y) cells from start to the
+        # goal, or None when the goal cannot be reached.
+        if start == self.goal:
+            return [start]
+        stride = self.stride
+        sx, sy = start
+        if not (0 <= sx < stride - 1 and 0 <= sy < len(self.blocked) // stride - 2):
+            return None
+        cell = (sy + 1) * stride + sx + 1
+        path = [start]
+        while self.distance[cell]:
+            cell = self.next_cell(cell)
+            if cell is None:
+                return None
+            y, x = divmod(cell, stride)
+            path.append((x - 1, y - 1))
+        return path
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+import pygame
+from config import TEXT_CACHE_SIZE
+
+DIGITS = '0123456789'
+
+
+class DigitAtlas:
+    def __init__(self, font, colour, antialias=True):
+        glyphs = [font.render(digit, antialias, colour) for digit in DIGITS]
+        self.advances = [font.metrics(digit)[0][4] for digit in DIGITS]
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height), pygame.SRCALPHA)
+        self.areas = []
+        x = 0
+        for glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.areas.append(pygame.Rect(x, 0, glyph.get_width(), glyph.get_height()))
+            x += glyph.get_width()
+
+    def compose(self, text):
+        indices = [DIGITS.index(char) for char in text]
+        width = sum(self.advances[i] for i in indices[:-1]) + self.areas[indices[-1]].width
+        surface = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        batch = []
+        x = 0
+        for i in indices:
+            batch.append((self.surface, (x, 0), self.areas[i]))
+            x += self.advances[i]
+        surface.blits(batch, doreturn=False)
+        return surface
+
+
+class FontCache:
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, path, size):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def _lookup(self, key):
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.texts.move_to_end(key)
+        else:
+            self.misses += 1
+        return surface
+
+    def _store(self, key, surface):
+        self.texts[key] = surface
+        if len(self.texts) > self.max_entries:
+            self.texts.popitem(last=False)
+        return surface
+
+    def render(self, font, text, colour, antialias=True):
+        text = str(text)
+        key = (font, text, tuple(colour), antialias)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self._store(key, font.render(text, antialias, colour))
+        return surface
+
+    def render_number(self, font, number, colour, antialias=True):
+        text = str(number)
+        if not text.isdigit():
+            return self.render(font, text, colour, antialias)
+
+        colour = tuple(colour)
+        key = (font, text, colour, antialias, DIGITS)
+        surface = self._lookup(key)
+        if surface is None:
+            atlas_key = (font, colour, antialias)
+            atlas = self.atlases.get(atlas_key)
+            if atlas is None:
+                atlas = self.atlases[atlas_key] = DigitAtlas(font, colour, antialias)
+            surface = self._store(key, atlas.compose(text))
+        return surface
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.texts),
+                'fonts': len(self.fonts), 'atlases': len(self.atlases)}
+
+
+font_cache = FontCache()
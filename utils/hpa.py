@@ -0,0 +1,289 @@
+import copy
+import heapq
+from itertools import chain
+from array import array
+from utils.pathfinding import STRAIGHT, DIAGONAL, OCTILE, INF, flatten_grid
+
+# Border runs at least this long get a transition at each end instead of
+# one in the middle.
+WIDE_ENTRANCE = 6
+
+
+class ClusterGraph:
+    # HPA*: the grid is cut into square clusters. Where a run of free cells
+    # crosses a cluster border, a transition joins the two clusters, and the
+    # shortest paths between transitions inside each cluster are stored. A
+    # query searches this small graph and stitches the stored cell paths
+    # together, so its cost grows with the number of clusters crossed rather
+    # than the grid area. Paths are near-shortest, not always shortest.
+    def __init__(self, grid, cluster_size):
+        self.cluster_size = cluster_size
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height else 0
+        self.blocked, self.stride = flatten_grid(grid, self.width)
+        self.columns = -(-self.width // cluster_size)
+        self.rows = -(-self.height // cluster_size)
+        self.owner = self._owners()
+        self.borders = {}
+        self.entrances = {}
+        self.transitions = {}
+        self.edges = {}
+        self.rebuilt = 0
+        self._rebuild(range(self.columns * self.rows))
+
+    def _owners(self):
+        owner = array('i', [-1]) * len(self.blocked)
+        size = self.cluster_size
+        for y in range(self.height):
+            base = (y + 1) * self.stride + 1
+            first = (y // size) * self.columns
+            for column in range(self.columns):
+                x0, x1 = column * size, min((column + 1) * size, self.width)
+                owner[base + x0:base + x1] = array('i', [first + column]) * (x1 - x0)
+        return owner
+
+    def _bounds(self, cluster):
+        row, column = divmod(cluster, self.columns)
+        size = self.cluster_size
+        return column * size, row * size, min((column + 1) * size, self.width), min((row + 1) * size, self.height)
+
+    def _neighbours(self, cluster):
+        # (border key, other cluster); the key lists the left/top cluster first.
+        row, column = divmod(cluster, self.columns)
+        if column > 0: yield (cluster - 1, cluster, True), cluster - 1
+        if column < self.columns - 1: yield (cluster, cluster + 1, True), cluster + 1
+        if row > 0: yield (cluster - self.columns, cluster, False), cluster - self.columns
+        if row < self.rows - 1: yield (cluster, cluster + self.columns, False), cluster + self.columns
+
+    def _scan_border(self, first, vertical):
+        blocked, stride = self.blocked, self.stride
+        x0, y0, x1, y1 = self._bounds(first)
+        if vertical:
+            cells = [(y + 1) * stride + x1 for y in range(y0, y1)]
+            step = 1
+        else:
+            cells = [y1 * stride + x + 1 for x in range(x0, x1)]
+            step = stride
+        pairs = []
+        run = []
+        for cell in cells + [None]:
+            if cell is not None and not blocked[cell] and not blocked[cell + step]:
+                run.append(cell)
+                continue
+            if run:
+                picks = (run[0], run[-1]) if len(run) >= WIDE_ENTRANCE else (run[len(run) // 2],)
+                pairs.extend((cell, cell + step) for cell in picks)
+                run = []
+        return pairs
+
+    def _rebuild(self, clusters):
+        # Rescanning a changed cluster's borders can move its neighbours'
+        # transitions, so they are refreshed too; their inner paths are only
+        # recomputed when their set of transitions actually changed.
+        dirty = set(clusters)
+        touched = set(dirty)
+        scanned = set()
+        for cluster in dirty:
+            for key, other in self._neighbours(cluster):
+                if key not in scanned:
+                    self.borders[key] = self._scan_border(key[0], key[2])
+                    scanned.add(key)
+                touched.add(other)
+
+        for cluster in touched:
+            old = self.entrances.get(cluster, frozenset())
+            for cell in old:
+                self.transitions.pop(cell, None)
+            cells = set()
+            for key, _ in self._neighbours(cluster):
+                inside = 0 if key[0] == cluster else 1
+                for pair in self.borders.get(key, ()):
+                    cell = pair[inside]
+                    cells.add(cell)
+                    self.transitions.setdefault(cell, []).append((pair[1 - inside], STRAIGHT, None))
+            cells = frozenset(cells)
+            self.entrances[cluster] = cells
+            if cluster in dirty or cells != old:
+                for cell in old:
+                    self.edges.pop(cell, None)
+                self._connect(cluster, cells)
+                self.rebuilt += 1
+
+    def _connect(self, cluster, cells):
+        cells = sorted(cells)
+        edges = {cell: [] for cell in cells}
+        for index, source in enumerate(cells):
+            targets = cells[index + 1:]
+            if not targets:
+                break
+            distance, parent = self._local(source, cluster, targets)
+            for target in targets:
+                if target in distance:
+                    path = self._trace(parent, target)[::-1]
+                    edges[source].append((target, distance[target], path))
+                    edges[target].append((source, distance[target], path[::-1]))
+        self.edges.update(edges)
+
+    def _local(self, source, cluster, targets):
+        # Dijkstra confined to one cluster; stops once every target is settled.
+        blocked, owner, stride = self.blocked, self.owner, self.stride
+        remaining = set(targets)
+        settled = {}
+        best = {source: 0}
+        parent = {source: None}
+        heap = [(0, source)]
+        while heap and remaining:
+            base, cell = heapq.heappop(heap)
+            if cell in settled:
+                continue
+            settled[cell] = base
+            remaining.discard(cell)
+            for offset in (-stride, stride, -1, 1):
+                neighbour = cell + offset
+                if owner[neighbour] != cluster or blocked[neighbour]:
+                    continue
+                cost = base + STRAIGHT
+                if cost < best.get(neighbour, INF):
+                    best[neighbour] = cost
+                    parent[neighbour] = cell
+                    heapq.heappush(heap, (cost, neighbour))
+            for step_x, step_y in ((-1, -stride), (1, -stride), (-1, stride), (1, stride)):
+                neighbour = cell + step_x + step_y
+                if owner[neighbour] != cluster or blocked[neighbour] \
+                        or blocked[cell + step_x] or blocked[cell + step_y]:
+                    continue
+                cost = base + DIAGONAL
+                if cost < best.get(neighbour, INF):
+                    best[neighbour] = cost
+                    parent[neighbour] = cell
+                    heapq.heappush(heap, (cost, neighbour))
+        return settled, parent
+
+    def _trace(self, parent, cell):
+        cells = []
+        while cell is not None:
+            cells.append(cell)
+            cell = parent[cell]
+        return cells
+
+    def updated(self, grid):
+        # A copy with only the clusters whose cells changed rebuilt. It shares
+        # everything else with this graph, which is left untouched, so a
+        # search already running on it is not disturbed.
+        blocked, stride = flatten_grid(grid, self.width)
+        if len(grid) != self.height or len(blocked) != len(self.blocked):
+            return ClusterGraph(grid, self.cluster_size)
+        old, owner = self.blocked, self.owner
+        dirty = set()
+        if blocked != old:
+            for y in range(self.height):
+                start = (y + 1) * stride + 1
+                end = start + self.width
+                if blocked[start:end] != old[start:end]:
+                    dirty.update(owner[cell] for cell in range(start, end) if blocked[cell] != old[cell])
+        graph = copy.copy(self)
+        graph.blocked = blocked
+        graph.borders = dict(self.borders)
+        graph.entrances = dict(self.entrances)
+        graph.transitions = dict(self.transitions)
+        graph.edges = dict(self.edges)
+        graph.rebuilt = 0
+        graph._rebuild(dirty)
+        return graph
+
+    def _start_links(self, source, target):
+        # Abstract edges out of the start: cell paths to every transition of
+        # its cluster, and to the goal when it shares the cluster. Like astar,
+        # a start inside an obstacle may step out in any direction, possibly
+        # into the next cluster.
+        blocked, owner, stride = self.blocked, self.owner, self.stride
+        starts = [(source, 0)]
+        if blocked[source]:
+            starts = [(source + offset, STRAIGHT) for offset in (-stride, stride, -1, 1)
+                      if not blocked[source + offset]]
+            starts += [(source + step_x + step_y, DIAGONAL)
+                       for step_x, step_y in ((-1, -stride), (1, -stride), (-1, stride), (1, stride))
+                       if not blocked[source + step_x + step_y] and not blocked[source + step_x]
+                       and not blocked[source + step_y]]
+        links = []
+        settled = 0
+        for cell, step in starts:
+            prefix = [source] if cell != source else []
+            if prefix:
+                links.append((cell, step, [source, cell]))
+            cluster = owner[cell]
+            exits = set(self.entrances[cluster])
+            if cluster == owner[target]:
+                exits.add(target)
+            exits.discard(cell)
+            distance, parent = self._local(cell, cluster, exits)
+            settled += len(distance)
+            for exit in exits.intersection(distance):
+                links.append((exit, step + distance[exit], prefix + self._trace(parent, exit)[::-1]))
+        return links, settled
+
+    def find_path(self, start, goal, stats=None):
+        # Same contract as astar: (x, y) cells from start to goal, or None.
+        (sx, sy), (gx, gy) = start, goal
+        if not (0 <= sx < self.width and 0 <= sy < self.height and 0 <= gx < self.width and 0 <= gy < self.height):
+            return None
+        if start == goal:
+            return [start]
+        stride, owner = self.stride, self.owner
+        source = (sy + 1) * stride + sx + 1
+        target = (gy + 1) * stride + gx + 1
+        if self.blocked[target]:
+            return None
+
+        goal_cluster = owner[target]
+        start_links, expanded = self._start_links(source, target)
+        goal_distance, goal_parent = self._local(target, goal_cluster, self.entrances[goal_cluster])
+        expanded += len(goal_distance)
+
+        gx, gy = gx + 1, gy + 1
+        best = {source: 0}
+        came = {source: None}
+        heap = [(0, 0, source)]
+        closed = set()
+        edges, transitions = self.edges, self.transitions
+        heappush, heappop = heapq.heappush, heapq.heappop
+        while heap:
+            _, cost, node = heappop(heap)
+            if node in closed:
+                continue
+            if node == target:
+                break
+            closed.add(node)
+            expanded += 1
+            links = start_links if node == source else edges.get(node, ())
+            if node != source and owner[node] == goal_cluster and node in goal_distance:
+                links = [*links, (target, goal_distance[node], self._trace(goal_parent, node))]
+            for cell, distance, segment in chain(links, transitions.get(node, ())):
+                total = cost + distance
+                if cell not in closed and total < best.get(cell, INF):
+                    best[cell] = total
+                    came[cell] = (node, segment)
+                    y, x = divmod(cell, stride)
+                    dx, dy = abs(x - gx), abs(y - gy)
+                    heappush(heap, (total + dx + dy + OCTILE * (dx if dx < dy else dy), total, cell))
+        else:
+            if stats is not None:
+                stats.expanded += expanded
+            return None
+        if stats is not None:
+            stats.expanded += expanded
+
+        segments = []
+        node = target
+        while node != source:
+            previous, segment = came[node]
+            segments.append(segment or (previous, node))
+            node = previous
+        cells = [source]
+        for segment in reversed(segments):
+            cells.extend(segment[1:])
+        path = []
+        for cell in cells:
+            y, x = divmod(cell, stride)
+            path.append((x - 1, y - 1))
+        return path
@@ -0,0 +1,59 @@
+import weakref
+import pygame
+
+EMPTY_BOUNDS = (0, 0, 0, 0)
+
+
+class MaskEntry:
+    def __init__(self, mask):
+        self.mask = mask
+        self.count = mask.count()
+        self.bounds = tuple(mask.get_bounding_rects()[0]) if self.count else EMPTY_BOUNDS
+
+
+class MaskCache:
+    def __init__(self):
+        # Tile and animation surfaces are shared through the tmx and asset
+        # caches, so surface identity plus its colorkey identifies the shape.
+        self.entries = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image, converted=False):
+        # converted: the shape of the SRCALPHA copy SpriteComponent makes of
+        # a colorkeyed image, rather than of the image itself.
+        per_image = self.entries.get(image)
+        if per_image is None:
+            per_image = self.entries[image] = {}
+
+        key = (image.get_colorkey(), converted)
+        entry = per_image.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        source = image
+        if converted:
+            source = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            source.blit(image, (0, 0))
+        entry = per_image[key] = MaskEntry(pygame.mask.from_surface(source))
+        return entry
+
+    def count(self, image):
+        return self.get(image).count
+
+    def bounds(self, image, converted=False):
+        return self.get(image, converted).bounds
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'surfaces': len(self.entries),
+                'hit_rate': self.hit_rate}
+
+
+mask_cache = MaskCache()
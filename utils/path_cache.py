@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+# Returned by lookup when the cache has no answer; None means unreachable.
+MISS = object()
+
+
+class PathCache:
+    # LRU of cell paths keyed by (start, goal, grid version), so a rebuilt
+    # grid never serves old paths; they just age out. Any stretch of a
+    # shortest path is a shortest path too, and moves cost the same both
+    # ways, so a query whose start and goal both lie on a cached path is
+    # answered by slicing it, reversed when they appear in the other order.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.paths = OrderedDict()
+        self.through = {}
+        self.hits = 0
+        self.sliced = 0
+        self.misses = 0
+        self.expanded = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def lookup(self, start, goal, version):
+        key = (start, goal, version)
+        if (entry := self.paths.get(key)) is not None:
+            self.paths.move_to_end(key)
+            self.hits += 1
+            return list(entry[0]) if entry[0] else None
+
+        for other in self.through.get((start, version), ()):
+            path, positions = self.paths[other]
+            if (end := positions.get(goal)) is not None:
+                begin = positions[start]
+                self.paths.move_to_end(other)
+                self.hits += 1
+                self.sliced += 1
+                return path[begin:end + 1] if begin <= end else path[end:begin + 1][::-1]
+
+        self.misses += 1
+        return MISS
+
+    def store(self, start, goal, version, path):
+        key = (start, goal, version)
+        if key in self.paths:
+            return
+        positions = None
+        if path:
+            positions = {cell: index for index, cell in enumerate(path)}
+            for cell in path:
+                self.through.setdefault((cell, version), set()).add(key)
+        # Unreachable goals are cached too; they are the most expensive miss.
+        self.paths[key] = (path, positions)
+        if len(self.paths) > self.capacity:
+            self._evict()
+
+    def find(self, start, goal, version, search):
+        if (path := self.lookup(start, goal, version)) is not MISS:
+            return path
+        path = search(start, goal)
+        self.store(start, goal, version, path)
+        return list(path) if path else None
+
+    def _evict(self):
+        key, (path, _) = self.paths.popitem(last=False)
+        version = key[2]
+        for cell in path or ():
+            keys = self.through[(cell, version)]
+            keys.discard(key)
+            if not keys:
+                del self.through[(cell, version)]
+
+    def clear(self):
+        self.paths.clear()
+        self.through.clear()
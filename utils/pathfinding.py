@@ -1,80 +1,100 @@
 import heapq
 
-class Node:
-    def __init__(self, position, parent=None):
-        self.position = position
-        self.parent = parent
-        self.g = 0  
-        self.h = 0  
-        self.f = 0  
-
-    def __eq__(self, other):
-        return self.position == other.position
-
-    def __lt__(self, other):
-        return self.f < other.f
-
-def astar(grid, start, end):
-    start_node = Node(start)
-    end_node = Node(end)
-
-    open_list = []
-    closed_list = set()
-
-    heapq.heappush(open_list, start_node)
-
-    while open_list:
-        current_node = heapq.heappop(open_list)
-        closed_list.add(current_node.position)
-
-        if current_node == end_node:
+STRAIGHT = 1
+DIAGONAL = 1.414
+# Octile distance with the same diagonal cost the moves use, so the
+# heuristic never overestimates and the first path to the goal is shortest.
+OCTILE = DIAGONAL - 2 * STRAIGHT
+INF = float('inf')
+
+
+def flatten_grid(grid, width):
+    # Cells are addressed as (y + 1) * stride + x + 1 on a copy of the grid
+    # with a blocked border. One blocked cell between rows serves as both the
+    # right edge of a row and the left edge of the next, and a blocked row
+    # above and below completes it, so neighbours never need a bounds check.
+    stride = width + 1
+    edge = b'\x01' * (stride + 1)
+    return bytearray(edge + b'\x01'.join(map(bytes, grid)) + edge), stride
+
+
+def astar(grid, start, end, stats=None):
+    # stats, when given, has its `expanded` count raised by the cells closed.
+    height = len(grid)
+    width = len(grid[0]) if height else 0
+    (sx, sy), (ex, ey) = start, end
+    if not (0 <= sx < width and 0 <= sy < height and 0 <= ex < width and 0 <= ey < height):
+        return None
+    if start == end:
+        return [start]
+
+    blocked, stride = flatten_grid(grid, width)
+    size = len(blocked)
+    g = [INF] * size
+    parent = [-1] * size
+    closed = bytearray(size)
+
+    start_cell = (sy + 1) * stride + sx + 1
+    end_cell = (ey + 1) * stride + ex + 1
+    ex += 1
+    ey += 1
+
+    straight = (-stride, stride, -1, 1)
+    diagonal = ((-1, -stride), (1, -stride), (-1, stride), (1, stride))
+
+    g[start_cell] = 0
+    dx, dy = abs(sx + 1 - ex), abs(sy + 1 - ey)
+    h = dx + dy + OCTILE * (dx if dx < dy else dy)
+    open_heap = [(h, h, start_cell)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    expanded = 0
+
+    while open_heap:
+        _, _, cell = heappop(open_heap)
+        # Improved cells are pushed again instead of being updated in place;
+        # the stale entries surface later and are skipped here.
+        if closed[cell]:
+            continue
+        if cell == end_cell:
+            if stats is not None:
+                stats.expanded += expanded
             path = []
-            current = current_node
-            while current is not None:
-                path.append(current.position)
-                current = current.parent
-            return path[::-1]  
-
-        (x, y) = current_node.position
-        
-        moves = [
-            (0, -1, 1),      
-            (0, 1, 1),       
-            (-1, 0, 1),      
-            (1, 0, 1),       
-            (-1, -1, 1.414), 
-            (1, -1, 1.414),  
-            (-1, 1, 1.414),  
-            (1, 1, 1.414)    
-        ]
-
-        for move_x, move_y, move_cost in moves:
-            new_position = (x + move_x, y + move_y)
-            (node_x, node_y) = new_position
-
-            if not (0 <= node_y < len(grid) and 0 <= node_x < len(grid[0])):
-                continue
-
-            if grid[node_y][node_x] != 0:
-                continue
-
-            if move_x != 0 and move_y != 0:
-                if grid[y][x + move_x] != 0 or grid[y + move_y][x] != 0:
-                    continue
-            
-            if new_position in closed_list:
+            while cell != -1:
+                y, x = divmod(cell, stride)
+                path.append((x - 1, y - 1))
+                cell = parent[cell]
+            return path[::-1]
+        closed[cell] = 1
+        expanded += 1
+        base = g[cell]
+
+        for offset in straight:
+            neighbour = cell + offset
+            if blocked[neighbour] or closed[neighbour]:
                 continue
-
-            new_node = Node(new_position, current_node)
-
-            if new_node in open_list:
+            cost = base + STRAIGHT
+            if cost < g[neighbour]:
+                g[neighbour] = cost
+                parent[neighbour] = cell
+                y, x = divmod(neighbour, stride)
+                dx, dy = abs(x - ex), abs(y - ey)
+                h = dx + dy + OCTILE * (dx if dx < dy else dy)
+                heappush(open_heap, (cost + h, h, neighbour))
+
+        for step_x, step_y in diagonal:
+            neighbour = cell + step_x + step_y
+            # No corner cutting: both orthogonal cells must be free.
+            if blocked[neighbour] or closed[neighbour] or blocked[cell + step_x] or blocked[cell + step_y]:
                 continue
-            
-            new_node.g = current_node.g + move_cost
-            new_node.h = abs(new_node.position[0] - end_node.position[0]) + \
-                         abs(new_node.position[1] - end_node.position[1])  
-            new_node.f = new_node.g + new_node.h
-            
-            heapq.heappush(open_list, new_node)
-
-    return None  
\ No newline at end of file
+            cost = base + DIAGONAL
+            if cost < g[neighbour]:
+                g[neighbour] = cost
+                parent[neighbour] = cell
+                y, x = divmod(neighbour, stride)
+                dx, dy = abs(x - ex), abs(y - ey)
+                h = dx + dy + OCTILE * (dx if dx < dy else dy)
+                heappush(open_heap, (cost + h, h, neighbour))
+
+    if stats is not None:
+        stats.expanded += expanded
+    return None
@@ -0,0 +1,96 @@
+from operator import attrgetter
+import pygame
+
+
+class SpatialHash:
+    def __init__(self, cell_size, rect_of=attrgetter('rect')):
+        self.cell_size = cell_size
+        self.rect_of = rect_of
+        self.cells = {}
+        self.item_cells = {}
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_to_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = set()
+                bucket.add(item)
+
+    def _remove_from_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(item)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, item):
+        if item in self.item_cells:
+            self.update(item)
+            return
+        cell_range = self._cell_range(self.rect_of(item))
+        self.item_cells[item] = cell_range
+        self._add_to_cells(item, cell_range)
+
+    def remove(self, item):
+        if (cell_range := self.item_cells.pop(item, None)) is not None:
+            self._remove_from_cells(item, cell_range)
+
+    def update(self, item):
+        old_range = self.item_cells.get(item)
+        if old_range is None:
+            return
+        new_range = self._cell_range(self.rect_of(item))
+        if new_range != old_range:
+            self._remove_from_cells(item, old_range)
+            self._add_to_cells(item, new_range)
+            self.item_cells[item] = new_range
+
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+
+    def candidates(self, rect):
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        found = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                if bucket := cells.get((cx, cy)):
+                    found.update(bucket)
+        return found
+
+    def query_rect(self, rect):
+        rect_of = self.rect_of
+        return [item for item in self.candidates(rect) if rect.colliderect(rect_of(item))]
+
+    def query_radius(self, center, radius):
+        cx, cy = center
+        radius_sq = radius * radius
+        area = pygame.Rect(int(cx - radius) - 1, int(cy - radius) - 1, int(2 * radius) + 3, int(2 * radius) + 3)
+        found = []
+        rect_of = self.rect_of
+        for item in self.candidates(area):
+            rect = rect_of(item)
+            dx = max(rect.left - cx, 0, cx - rect.right)
+            dy = max(rect.top - cy, 0, cy - rect.bottom)
+            if dx * dx + dy * dy <= radius_sq:
+                found.append(item)
+        return found
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def __len__(self):
+        return len(self.item_cells)